@@ -1,25 +1,45 @@
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
+import homeassistant.helpers.config_validation as cv
 
-from .const import DOMAIN
+from .battery import BatteryPlanner
+from .const import DEFAULT_ZONE, DOMAIN
 from .coordinator import Frank2Coordinator
+from .services import async_setup_services
+from .source import async_acquire_source, async_release_source
+from .tariff import TariffProfile
+from .websocket_api import async_setup_websocket_api
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config) -> bool:
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    token = entry.data["token"]
+    source = async_acquire_source(hass, token, entry.data.get("zone", DEFAULT_ZONE))
+    entry.async_on_unload(lambda: async_release_source(hass, source, token))
     coordinator = Frank2Coordinator(
         hass,
-        entry.data["token"],
-        "10YNL----------L",  # Hardcoded for Netherlands
-        entry.data["inkoop"],
-        entry.data["eb"],
-        entry.data["btw"]
+        source,
+        TariffProfile.from_entry_data(entry.data),
+        entry.data.get("lowest_periods_count", 14),
+        entry.data.get("highest_periods_count", 8),
+        entry.data.get("window_duration", 120),
+        BatteryPlanner.from_entry_data(entry.data),
+        entry.data.get("percentile_threshold", 20),
+        entry.data.get("price_list_attributes", False)
     )
-    await coordinator.async_config_entry_first_refresh()
+    if await coordinator.async_load_cache():
+        # Entities start from the cache, anything missing is fetched in the background
+        entry.async_create_background_task(hass, coordinator.async_refresh(), f"{DOMAIN} refresh")
+    else:
+        await coordinator.async_config_entry_first_refresh()
     entry.runtime_data = coordinator
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor", "number"])
     return True
 
-async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    return await hass.config_entries.async_unload_platforms(entry, ["sensor", "number"])
-
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return await hass.config_entries.async_unload_platforms(entry, ["sensor", "number"])
\ No newline at end of file
@@ -0,0 +1,155 @@
+import math
+import mmap
+import os
+import struct
+import threading
+from array import array
+
+# start (UTC epoch seconds), length in seconds, net price (EUR/kWh)
+RECORD = struct.Struct("<qid")
+
+
+class PriceArchive:
+    """Append-only file of fixed-width slot records sorted by start.
+
+    Records with a NaN price only mark a span as fetched without prices, so a
+    backfill can resume after it. Reads bisect and slice a memory map of the
+    file without copying it. All methods do blocking I/O and belong in the
+    executor.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # Reentrant, append reads the end and writes while holding it
+        self._lock = threading.RLock()
+        self._map = None
+        self._mapped_size = 0
+
+    def _size(self):
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def __len__(self):
+        return self._size() // RECORD.size
+
+    def _view(self):
+        """Memory view of all complete records, remapped when the file grew."""
+        with self._lock:
+            size = self._size() // RECORD.size * RECORD.size
+            if size != self._mapped_size:
+                # Views handed out earlier keep their map alive until released
+                self._map = None
+                self._mapped_size = size
+                if size:
+                    with open(self.path, "rb") as file:
+                        self._map = mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ)
+            return memoryview(self._map) if self._map is not None else memoryview(b"")
+
+    def _record(self, view, i):
+        return RECORD.unpack_from(view, i * RECORD.size)
+
+    @property
+    def start(self):
+        view = self._view()
+        return self._record(view, 0)[0] if len(view) else None
+
+    @property
+    def end(self):
+        view = self._view()
+        if not len(view):
+            return None
+        start, seconds, _ = self._record(view, len(view) // RECORD.size - 1)
+        return start + seconds
+
+    def append(self, records):
+        """Append (start, seconds, price) records, skipping those before the current end.
+
+        Returns the number of records written.
+        """
+        with self._lock:
+            end = self.end
+            data = bytearray()
+            for start, seconds, price in sorted(records):
+                if end is not None and start < end:
+                    continue
+                data += RECORD.pack(start, seconds, price)
+                end = start + seconds
+            if data:
+                with open(self.path, "ab") as file:
+                    file.write(data)
+        return len(data) // RECORD.size
+
+    def extend(self, records):
+        """Append records only when the first one starts where the archive ends.
+
+        A gap before them is left for a backfill to fetch, appending past it
+        would move the end the backfill resumes from beyond the gap. Returns
+        the number of records written.
+        """
+        with self._lock:
+            end = self.end
+            if end is not None and records and min(records)[0] != end:
+                return 0
+            return self.append(records)
+
+    def mark(self, start, end):
+        """Record [start, end) as fetched, for the parts not covered yet."""
+        with self._lock:
+            current = self.end
+            if current is not None:
+                start = max(start, current)
+            if start < end:
+                self.append([(start, end - start, math.nan)])
+
+    def _bisect(self, view, ts):
+        """Index of the first record starting at or after ts."""
+        lo, hi = 0, len(view) // RECORD.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(view, mid)[0] < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def read(self, start=None, end=None):
+        """Zero-copy view of the records starting in [start, end)."""
+        view = self._view()
+        lo = 0 if start is None else self._bisect(view, start)
+        hi = len(view) // RECORD.size if end is None else self._bisect(view, end)
+        return view[lo * RECORD.size:max(lo, hi) * RECORD.size]
+
+    def records(self, start=None, end=None):
+        """(start, seconds, price) of the priced slots starting in [start, end)."""
+        for record in RECORD.iter_unpack(self.read(start, end)):
+            if not math.isnan(record[2]):
+                yield record
+
+    def prices(self, start=None, end=None):
+        return array("d", (price for _, _, price in self.records(start, end)))
+
+    def prepend(self, other):
+        """Replace this archive by other followed by the records of this one after other ends."""
+        # Held throughout, a write between reading the tail and the replace would be lost
+        with self._lock:
+            tail = self.read(other.end)
+            with open(other.path, "ab") as file:
+                file.write(tail)
+            tail.release()
+            other.close()
+            self.close()
+            os.replace(other.path, self.path)
+
+    def close(self):
+        """Unmap the file, the next read maps it again."""
+        with self._lock:
+            if self._map is not None:
+                try:
+                    self._map.close()
+                except BufferError:
+                    # Views still in use keep the map, it is unmapped with the last one
+                    pass
+            self._map = None
+            self._mapped_size = 0
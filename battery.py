@@ -0,0 +1,199 @@
+import math
+from array import array
+from datetime import datetime
+
+from homeassistant.util import dt as dt_util
+
+from .prices import SLOT_SECONDS, average
+
+# State of charge steps of the dynamic program (1% of the capacity)
+BATTERY_LEVELS = 100
+# Finer steps are used when a quarter hour at the configured power moves less
+# than one level, up to this many
+MAX_BATTERY_LEVELS = 2000
+
+IDLE = 0
+CHARGE = 1
+DISCHARGE = 2
+ACTIONS = ("idle", "charge", "discharge")
+
+
+def _levels(capacity, charge_power, discharge_power):
+    """State of charge levels, fine enough for a quarter hour at either power to move at least one level."""
+    energies = [power * SLOT_SECONDS / 3600 for power in (charge_power, discharge_power) if power]
+    if not energies:
+        return BATTERY_LEVELS
+    return min(MAX_BATTERY_LEVELS, max(BATTERY_LEVELS, math.ceil(capacity / min(energies) - 1e-9)))
+
+
+def _steps(power, hours, step):
+    """Whole levels moved in a slot without exceeding power, floored so the limit is respected."""
+    return int(power * hours / step + 1e-9)
+
+
+class BatteryPlanner:
+    """Charge/idle/discharge planner for a home battery or EV.
+
+    Energy bought while charging costs the slot price, energy delivered while
+    discharging earns the feed-in price. The round-trip efficiency is split evenly over
+    charging and discharging, energy left at the end is valued at the average
+    price of the horizon so the plan does not simply empty the battery. A slot
+    moves whole state of charge levels, never more energy than the charge or
+    discharge power allows.
+    """
+
+    def __init__(self, capacity, charge_power, discharge_power, efficiency, soc_entity=None,
+                 levels=None):
+        self.capacity = capacity
+        self.charge_power = charge_power
+        self.discharge_power = discharge_power
+        self.efficiency = efficiency
+        self.soc_entity = soc_entity
+        self.levels = levels or _levels(capacity, charge_power, discharge_power)
+        # State of charge level each slot start was planned to begin with, used
+        # when no state of charge entity is configured
+        self._expected = {}
+        self._plan_policy = None
+        self._plan_key = None
+        self._plan = None
+
+    @classmethod
+    def from_entry_data(cls, data):
+        """Planner for the battery options of a config entry, None when no battery is configured."""
+        if not data.get("battery_capacity"):
+            return None
+        return cls(
+            data["battery_capacity"],
+            data.get("battery_charge_power", 0.0),
+            data.get("battery_discharge_power", 0.0),
+            data.get("battery_efficiency", 90.0),
+            data.get("battery_soc_entity"),
+        )
+
+    def solve(self, snapshot, now=None):
+        """Backward pass over all slots from the current one, runs in the executor."""
+        index = snapshot.index
+        first = index.slot_at(now)
+        if first is None:
+            first = index.first_after(now)
+        return BatteryPolicy(self, snapshot, first)
+
+    def plan(self, policy, soc=None, now=None):
+        """Plan from the current slot, soc in percent.
+
+        Only walks the stored policy forward, the dynamic program itself is
+        solved once per snapshot.
+        """
+        if policy is None:
+            return None
+        current = policy.snapshot.index.slot_at(now)
+        if current is None:
+            current = policy.snapshot.index.first_after(now)
+        current = max(current, policy.first)
+        if current >= policy.end:
+            return None
+        if soc is None:
+            level = self._expected.get(policy.snapshot.index.starts[current], 0)
+        else:
+            level = min(self.levels, max(0, round(soc * self.levels / 100)))
+        if policy is not self._plan_policy or (current, level) != self._plan_key:
+            self._plan_policy = policy
+            self._plan_key = (current, level)
+            self._plan = policy.walk(current, level)
+            self._expected = {slot_start: slot_level for slot_start, slot_level in self._plan.levels}
+        return self._plan
+
+
+class BatteryPolicy:
+    """Best action per slot and state of charge level, from the backward pass."""
+
+    def __init__(self, planner, snapshot, first):
+        self.planner = planner
+        self.snapshot = snapshot
+        self.first = first
+        self.end = len(snapshot.prices)
+        levels = planner.levels
+        step = planner.capacity / levels
+        eta = (planner.efficiency / 100) ** 0.5
+        prices = snapshot.prices
+        sell_prices = snapshot.sell_prices
+        starts = snapshot.index.starts
+        ends = snapshot.index.ends
+        states = range(levels + 1)
+
+        terminal_price = average(prices[first:self.end]) or 0.0
+        values = [-s * step * eta * terminal_price for s in states]
+        self.moves = []
+        self.actions = []
+        for t in range(self.end - 1, first - 1, -1):
+            hours = (ends[t] - starts[t]) / 3600
+            # A slot that moves no whole level leaves that action out
+            up = _steps(planner.charge_power, hours, step)
+            down = _steps(planner.discharge_power, hours, step)
+            charge_to = [min(levels, s + up) for s in states]
+            discharge_to = [max(0, s - down) for s in states]
+            buy = step / eta * prices[t]
+            sell = step * eta * sell_prices[t]
+            actions = array("b", bytes(levels + 1))
+            new_values = [0.0] * (levels + 1)
+            for s in states:
+                best = values[s]
+                action = IDLE
+                to = charge_to[s]
+                if to != s:
+                    value = (to - s) * buy + values[to]
+                    if value < best:
+                        best, action = value, CHARGE
+                to = discharge_to[s]
+                if to != s:
+                    value = (to - s) * sell + values[to]
+                    if value < best:
+                        best, action = value, DISCHARGE
+                actions[s] = action
+                new_values[s] = best
+            values = new_values
+            self.actions.append(actions)
+            self.moves.append((charge_to, discharge_to))
+        self.actions.reverse()
+        self.moves.reverse()
+        # Cost of following the policy from the first slot, per starting level
+        self.values = values
+
+    def walk(self, current, level):
+        """Follow the policy from a slot and state of charge level."""
+        return BatteryPlan(self, current, level)
+
+
+class BatteryPlan:
+    """Action and resulting state of charge per slot, with consecutive equal actions merged."""
+
+    def __init__(self, policy, current, level):
+        starts = policy.snapshot.index.starts
+        ends = policy.snapshot.index.ends
+        levels = policy.planner.levels
+        self.levels = []
+        blocks = []
+        for t in range(current, policy.end):
+            self.levels.append((starts[t], level))
+            action = policy.actions[t - policy.first][level]
+            charge_to, discharge_to = policy.moves[t - policy.first]
+            if action == CHARGE:
+                level = charge_to[level]
+            elif action == DISCHARGE:
+                level = discharge_to[level]
+            if blocks and blocks[-1][2] == action and blocks[-1][1] == starts[t]:
+                blocks[-1][1] = ends[t]
+                blocks[-1][3] = level
+            else:
+                blocks.append([starts[t], ends[t], action, level])
+        self.action = ACTIONS[blocks[0][2]] if blocks else None
+        tz = dt_util.get_default_time_zone()
+        self.schedule = [
+            {
+                "start": datetime.fromtimestamp(start, tz).isoformat(),
+                "end": datetime.fromtimestamp(end, tz).isoformat(),
+                "action": ACTIONS[action],
+                "soc": round(level * 100 / levels),
+            }
+            for start, end, action, level in blocks
+        ]
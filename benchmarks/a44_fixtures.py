@@ -0,0 +1,52 @@
+"""Synthetic ENTSO-E A44 documents shaped like the day-ahead price publication.
+
+One TimeSeries per delivery day with a PT15M A01 period, the way the
+transparency platform answers a multi-day request for a bidding zone.
+
+    python benchmarks/a44_fixtures.py OUTPUT_DIR [--first 2025-01-01]
+"""
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from homeassistant.util import dt as dt_util
+
+from common import ROOT, load_integration, net_price
+
+# The stand-in server of the tests serves documents from the same generator
+sys.path.insert(0, str(ROOT / "tests"))
+from entsoe_server import a44_body  # noqa: E402
+
+SIZES = {"1day": 1, "7days": 7, "1year": 365}
+
+
+def a44_document(first, days, seed=0):
+    """A44 document with the prices of days local delivery days from date first."""
+    rng = random.Random(seed)
+    bounds = [int(dt_util.start_of_local_day(first + timedelta(days=offset)).timestamp()) for offset in range(days + 1)]
+    return a44_body(bounds, lambda start: net_price(start, rng) * 1000)
+
+
+def fixtures(first):
+    """The benchmark documents by name, 1 day, 7 days and a year from date first."""
+    return {name: a44_document(first, days) for name, days in SIZES.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("output", type=Path, help="directory the documents are written to")
+    parser.add_argument("--first", type=lambda value: datetime.strptime(value, "%Y-%m-%d").date(),
+                        default=datetime(2025, 1, 1).date(), help="first delivery day (default 2025-01-01)")
+    args = parser.parse_args()
+    load_integration()
+    args.output.mkdir(parents=True, exist_ok=True)
+    for name, body in fixtures(args.first).items():
+        path = args.output / f"a44_{name}.xml"
+        path.write_bytes(body)
+        print(f"{path}: {len(body) / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
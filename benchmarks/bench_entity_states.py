@@ -0,0 +1,152 @@
+"""Cost of writing the state of every price entity, before and after the price snapshot.
+
+Before: the sensors of the first release, where every state and attribute
+property rescans coordinator.data, parses the ISO timestamps and sorts the
+points again. After: the current sensors, which read the PriceSnapshot that
+the coordinator builds once per refresh.
+
+A state write evaluates the state and the attributes and serializes them for
+the state machine and the recorder, the benchmark does the same for the 14
+entities of the first release. The first release always wrote the full price
+lists, the same payload comes from the current sensors with the
+price_list_attributes option, the summary attributes are shown for reference.
+
+    python benchmarks/bench_entity_states.py [--days 2]
+"""
+import argparse
+import json
+import subprocess
+import time
+from types import ModuleType, SimpleNamespace
+
+from common import ROOT, SLOT_SECONDS, days_from, load_integration, net_prices, timed, today
+
+load_integration()
+
+from frank2.prices import PriceSeries, PriceSnapshot, render_point  # noqa: E402
+from frank2.tariff import TariffProfile  # noqa: E402
+import frank2.sensor  # noqa: E402
+
+# Root commit, before the snapshot was introduced
+BASELINE = "4110965"
+ENTITIES = (
+    "Frank2AllInSensor",
+    "Frank2CurrentAllInSensor",
+    "Frank2FutureAveragePriceSensor",
+    "Frank2AverageElectricityTodaySensor",
+    "Frank2AverageElectricityTomorrowSensor",
+    "Frank2LowestPeriodsFutureSensor",
+    "Frank2LowestPeriodsTomorrowSensor",
+    "Frank2HighestPeriodsTomorrowSensor",
+    "Frank2PriceDiffFutureSensor",
+    "Frank2HighestPeriodsTodaySensor",
+    "Frank2LowestPeriodsTodaySensor",
+    "Frank2InHighestPeriod",
+    "Frank2InLowestPeriod",
+    "Frank2InLowestPeriodsFuture",
+)
+LOWEST_PERIODS = 14
+HIGHEST_PERIODS = 8
+TARIFF = TariffProfile(inkoop=0.0182, eb=0.1228, btw=21)
+
+
+def baseline_sensor_module():
+    """sensor.py of the baseline commit, imported next to the current modules."""
+    source = subprocess.run(
+        ["git", "-C", str(ROOT), "show", f"{BASELINE}:sensor.py"], capture_output=True, text=True, check=True
+    ).stdout
+    module = ModuleType("frank2.sensor_baseline")
+    module.__package__ = "frank2"
+    exec(compile(source, f"{BASELINE}:sensor.py", "exec"), module.__dict__)
+    return module
+
+
+def price_days(days):
+    """All-in price series per YYYYMMDD, from today on."""
+    data = {}
+    for day in days_from(today(), days):
+        starts, net = net_prices(day, 1, seed=day.toordinal())
+        data[day.strftime("%Y%m%d")] = TARIFF.apply(PriceSeries(starts[0], SLOT_SECONDS, net, net))
+    return data
+
+
+def baseline_data(data):
+    """coordinator.data of the baseline, a list of point dicts per day."""
+    return {
+        date_str: [
+            render_point(*slot) for slot in zip(series.starts, series.ends, series.prices, series.net_prices)
+        ]
+        for date_str, series in data.items()
+    }
+
+
+def write_all(entities):
+    """Evaluate and serialize every state the way a state write does, returns the payload size."""
+    size = 0
+    for entity in entities:
+        payload = {"state": entity.state, "attributes": entity.extra_state_attributes or {}}
+        size += len(json.dumps(payload, default=str))
+    return size
+
+
+def entities_of(module, coordinator):
+    entry = SimpleNamespace(
+        entry_id="benchmark",
+        data={"lowest_periods_count": LOWEST_PERIODS, "highest_periods_count": HIGHEST_PERIODS},
+    )
+    return [getattr(module, name)(coordinator, entry) for name in ENTITIES]
+
+
+def cold_write(refresh, repeat=5):
+    """Best time of the first write after a refresh, the snapshot build is timed on its own."""
+    best = None
+    for _ in range(repeat):
+        entities = refresh()
+        started = time.perf_counter()
+        size = write_all(entities)
+        seconds = time.perf_counter() - started
+        best = seconds if best is None else min(best, seconds)
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--days", type=int, default=2, help="days with prices, from today (default 2)")
+    args = parser.parse_args()
+
+    data = price_days(args.days)
+    before = entities_of(baseline_sensor_module(), SimpleNamespace(data=baseline_data(data)))
+
+    def refresh(price_list_attributes=False):
+        coordinator = SimpleNamespace(
+            snapshot=PriceSnapshot(data, LOWEST_PERIODS, HIGHEST_PERIODS),
+            price_list_attributes=price_list_attributes,
+        )
+        return entities_of(frank2.sensor, coordinator)
+
+    print(f"{len(ENTITIES)} entities, {args.days} days of {SLOT_SECONDS // 60} minute prices")
+    print(f"{'':<60}{'time':>10}{'payload':>12}")
+    before_seconds, size = timed(write_all, before)
+    rows = [("before: every write (full price lists)", before_seconds, size)]
+    snapshot_seconds, _ = timed(PriceSnapshot, data, LOWEST_PERIODS, HIGHEST_PERIODS)
+    rows.append(("after: snapshot build, once per refresh", snapshot_seconds, None))
+    after = {}
+    for label, full in (("full price lists", True), ("summaries, the default", False)):
+        # Slot dependent values are computed by the first write after a refresh, later writes are lookups
+        seconds, size = cold_write(lambda: refresh(full))
+        rows.append((f"after, {label}: first write after a refresh", seconds, size))
+        after[full] = seconds
+        entities = refresh(full)
+        write_all(entities)
+        seconds, size = timed(write_all, entities)
+        rows.append((f"after, {label}: later writes", seconds, size))
+    for label, seconds, size in rows:
+        payload = "" if size is None else f"{size:>10} B"
+        print(f"{label:<60}{seconds * 1000:>7.2f} ms{payload}")
+    # Same payload on both sides, the snapshot counted against the first write
+    print(f"same payload, first write after a refresh: {before_seconds / after[True]:.1f}x, "
+          f"with the snapshot build: {before_seconds / (after[True] + snapshot_seconds):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
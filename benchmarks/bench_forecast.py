@@ -0,0 +1,88 @@
+"""Backtest of the price forecaster over a year of synthetic archived prices.
+
+Walk-forward: the forecaster is retrained every --refit days on everything
+before that day, then each following day is forecast from the days before
+it, the way the coordinator forecasts tomorrow (day ahead) and the day after
+from the forecast of tomorrow (two days ahead). The mean absolute error is
+compared with the naive forecasts, the same quarter hour a week or a day
+before. Training time is reported per refit and for a fit on the whole year.
+
+    python benchmarks/bench_forecast.py [--days 365] [--refit 28]
+"""
+import argparse
+import random
+import time
+from datetime import timedelta
+
+from common import SLOT_SECONDS, days_from, load_integration, net_prices, today
+
+load_integration()
+
+from frank2.forecast import PriceForecaster, day_profiles  # noqa: E402
+
+# Days of history before the first forecast
+WARMUP_DAYS = 28
+
+
+def archive_records(first, days, seed=0):
+    """(start, seconds, net price) records with a persistent day level on top of the daily shape."""
+    rng = random.Random(seed)
+    level = 0.0
+    records = []
+    for day in days_from(first, days):
+        level = 0.8 * level + rng.gauss(0, 0.02)
+        starts, prices = net_prices(day, 1, seed=rng.random())
+        records.extend((t, SLOT_SECONDS, round(p + level, 5)) for t, p in zip(starts, prices))
+    return records
+
+
+def mean_absolute_error(pairs):
+    errors = [abs(p - a) for p, a in pairs if p is not None and a is not None]
+    return sum(errors) / len(errors) if errors else None
+
+
+def series_profile(series):
+    return next(iter(day_profiles(
+        (series.start_at(i), series.resolution, price) for i, price in enumerate(series.net_prices)
+    ).values()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--days", type=int, default=365, help="days of archived prices (default 365)")
+    parser.add_argument("--refit", type=int, default=28, help="days between retraining (default 28)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    profiles = day_profiles(archive_records(today() - timedelta(days=args.days), args.days, args.seed))
+    dates = sorted(profiles)
+    pairs = {"day ahead": [], "two days ahead": [], "week before": [], "day before": []}
+    fit_seconds = []
+    forecaster = PriceForecaster()
+    for i in range(WARMUP_DAYS, len(dates), args.refit):
+        started = time.perf_counter()
+        forecaster.fit({date: profiles[date] for date in dates[:i]})
+        fit_seconds.append(time.perf_counter() - started)
+        for date in dates[i:i + args.refit]:
+            known = {day: profile for day, profile in profiles.items() if day < date}
+            forecast = forecaster.forecast(known, [date, date + timedelta(days=1)])
+            actual = profiles[date]
+            for label, day in (("day ahead", date), ("two days ahead", date + timedelta(days=1))):
+                if day in profiles and day.strftime("%Y%m%d") in forecast:
+                    pairs[label].extend(zip(series_profile(forecast[day.strftime("%Y%m%d")]), profiles[day]))
+            for label, offset in (("week before", 7), ("day before", 1)):
+                pairs[label].extend(zip(profiles[date - timedelta(days=offset)], actual))
+
+    full = PriceForecaster()
+    full.fit(profiles)
+    print(f"{len(dates)} days, {len(dates) - WARMUP_DAYS} forecast days, retrained every {args.refit} days")
+    print(f"{'forecast':<16}{'MAE (EUR/kWh)':>15}")
+    for label, values in pairs.items():
+        print(f"{label:<16}{mean_absolute_error(values):>15.5f}")
+    print(f"training: {len(fit_seconds)} refits, mean {sum(fit_seconds) / len(fit_seconds):.2f} s, "
+          f"max {max(fit_seconds):.2f} s")
+    print(f"full year fit: {full.training_seconds:.2f} s, holdout MAE {full.mae}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Parsing A44 documents, the streaming A44Parser against building the whole tree.
+
+The tree variant is what the first release did: ET.fromstring on the full
+response and a namespaced find for every Point. A44Parser is fed the bytes
+in CHUNK_SIZE pieces, as they come off the network. Peak allocation is
+traced separately from the timing runs and excludes the document itself.
+
+    python benchmarks/bench_parser.py
+"""
+import argparse
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from a44_fixtures import SIZES, fixtures
+from common import load_integration, timed, today
+from entsoe_server import NAMESPACE
+
+load_integration()
+
+from frank2.entsoe import A44Parser  # noqa: E402
+from frank2.source import CHUNK_SIZE  # noqa: E402
+
+NS = {"ns": NAMESPACE}
+
+
+def parse_tree(body):
+    root = ET.fromstring(body)
+    points = []
+    for time_series in root.findall(".//ns:TimeSeries", NS):
+        for point in time_series.findall(".//ns:Point", NS):
+            position = int(point.find("ns:position", NS).text)
+            price = point.find("ns:price.amount", NS)
+            if price is not None:
+                points.append((position, float(price.text)))
+    return len(points)
+
+
+def parse_streaming(body):
+    parser = A44Parser()
+    for i in range(0, len(body), CHUNK_SIZE):
+        parser.feed(body[i:i + CHUNK_SIZE])
+    parser.close()
+    return parser.points
+
+
+def peak_allocation(func, body):
+    tracemalloc.start()
+    try:
+        func(body)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs per document, best is kept (default 3)")
+    args = parser.parse_args()
+
+    documents = fixtures(today())
+    print(f"{'document':<10}{'parser':<11}{'points':>8}{'time':>11}{'points/s':>12}{'MiB/s':>8}{'peak':>11}")
+    for name in SIZES:
+        body = documents[name]
+        for label, func in (("tree", parse_tree), ("streaming", parse_streaming)):
+            seconds, points = timed(func, body, repeat=args.repeat)
+            peak = peak_allocation(func, body)
+            print(f"{name:<10}{label:<11}{points:>8}{seconds * 1000:>8.1f} ms{points / seconds:>12,.0f}"
+                  f"{len(body) / seconds / 2 ** 20:>8.1f}{peak / 2 ** 20:>7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
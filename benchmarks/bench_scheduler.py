@@ -0,0 +1,74 @@
+"""Scheduling 10 to 50 flexible jobs over two days of quarter hour prices under a power cap.
+
+Jobs are drawn from appliance-like profiles (EV, heat pump boost, boiler,
+washing machine, dishwasher) with random time limits. Reported per job
+count: wall time, the status of the result (optimal when the branch and
+bound search completed within EXACT_NODE_LIMIT nodes), the plan cost and
+the number of jobs left unscheduled.
+
+    python benchmarks/bench_scheduler.py [--jobs 10 20 30 40 50] [--max-power 17]
+"""
+import argparse
+import random
+
+from common import SLOT_SECONDS, days_from, load_integration, net_prices, timed, today
+
+load_integration()
+
+from frank2.prices import PriceSeries, PriceSnapshot  # noqa: E402
+from frank2.scheduler import EXACT_NODE_LIMIT, Job, schedule_jobs  # noqa: E402
+
+DAYS = 2
+# (name, duration range in quarter hours, power range in kW)
+PROFILES = [
+    ("ev", (8, 24), (3.7, 11.0)),
+    ("heat_pump_boost", (2, 8), (1.5, 3.0)),
+    ("boiler", (4, 8), (2.0, 3.0)),
+    ("washing_machine", (4, 8), (0.5, 2.0)),
+    ("dishwasher", (4, 10), (0.5, 1.8)),
+]
+
+
+def price_snapshot():
+    """Snapshot of DAYS days from today, 192 slots."""
+    data = {}
+    for day in days_from(today(), DAYS):
+        starts, net = net_prices(day, 1, seed=day.toordinal())
+        data[day.strftime("%Y%m%d")] = PriceSeries(starts[0], SLOT_SECONDS, net, net)
+    return PriceSnapshot(data, 14, 8)
+
+
+def random_jobs(count, first, last, rng):
+    """count jobs, each with a window of at least twice its duration between first and last."""
+    jobs = []
+    for i in range(count):
+        name, slots, power = rng.choice(PROFILES)
+        duration = rng.randint(*slots) * SLOT_SECONDS
+        window = rng.randint(2 * duration // SLOT_SECONDS, (last - first) // SLOT_SECONDS) * SLOT_SECONDS
+        earliest = first + rng.randrange(0, (last - first - window) // SLOT_SECONDS + 1) * SLOT_SECONDS
+        jobs.append(Job(f"{name}_{i}", duration, round(rng.uniform(*power), 1), earliest, earliest + window))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--jobs", type=int, nargs="+", default=[10, 20, 30, 40, 50], help="job counts")
+    parser.add_argument("--max-power", type=float, default=17.0, help="connection capacity in kW (default 17)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    snapshot = price_snapshot()
+    starts = snapshot.index.starts
+    first, last = starts[0], snapshot.index.ends[-1]
+    print(f"{len(starts)} slots, max power {args.max_power} kW, EXACT_NODE_LIMIT {EXACT_NODE_LIMIT}")
+    print(f"{'jobs':>5}{'time':>12}{'status':>20}{'cost':>11}{'unscheduled':>13}")
+    for count in args.jobs:
+        jobs = random_jobs(count, first, last, random.Random(args.seed * 1000 + count))
+        # now just before the first slot so the whole horizon is available
+        seconds, result = timed(schedule_jobs, snapshot, jobs, args.max_power, first - 1, repeat=3)
+        print(f"{count:>5}{seconds * 1000:>9.1f} ms{result['status']:>20}"
+              f"{result['total_cost']:>11.3f}{len(result['unscheduled']):>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Shared setup of the benchmarks, run them with python benchmarks/<name>.py.
+
+The repository root is the frank2 integration package, it is imported under
+that name the same way Home Assistant loads it from custom_components.
+"""
+import importlib.util
+import math
+import random
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from homeassistant.util import dt as dt_util
+
+ROOT = Path(__file__).resolve().parent.parent
+TIME_ZONE = "Europe/Amsterdam"
+SLOT_SECONDS = 15 * 60
+
+
+def load_integration():
+    """Import the integration as frank2, with the Dutch market time zone as local time."""
+    dt_util.set_default_time_zone(ZoneInfo(TIME_ZONE))
+    if "frank2" not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            "frank2", ROOT / "__init__.py", submodule_search_locations=[str(ROOT)]
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["frank2"] = module
+        spec.loader.exec_module(module)
+    return sys.modules["frank2"]
+
+
+def net_price(start, rng):
+    """Plausible net day-ahead price (EUR/kWh) of the quarter hour starting at start.
+
+    Morning and evening peaks, a midday solar dip, cheaper weekends and a
+    slow seasonal swing, plus noise from rng.
+    """
+    local = dt_util.as_local(dt_util.utc_from_timestamp(start))
+    hour = local.hour + local.minute / 60
+    day_of_year = local.timetuple().tm_yday
+    price = 0.09 + 0.03 * math.cos(2 * math.pi * day_of_year / 365)
+    price += 0.04 * math.exp(-((hour - 8) ** 2) / 4) + 0.06 * math.exp(-((hour - 19) ** 2) / 6)
+    price -= 0.05 * math.exp(-((hour - 13) ** 2) / 5)
+    if local.weekday() >= 5:
+        price -= 0.015
+    return round(price + rng.gauss(0, 0.012), 5)
+
+
+def net_prices(first, days, seed=0):
+    """(slot starts, net prices) of days local days from date first."""
+    rng = random.Random(seed)
+    start = int(dt_util.start_of_local_day(first).timestamp())
+    end = int(dt_util.start_of_local_day(first + timedelta(days=days)).timestamp())
+    starts = list(range(start, end, SLOT_SECONDS))
+    return starts, [net_price(t, rng) for t in starts]
+
+
+def today():
+    return dt_util.now().date()
+
+
+def days_from(first, days):
+    return [first + timedelta(days=offset) for offset in range(days)]
+
+
+def timed(func, *args, repeat=5, number=1):
+    """Best wall time in seconds of number calls of func, over repeat runs, and its last result."""
+    best = math.inf
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            result = func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
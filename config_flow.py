@@ -2,25 +2,50 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.core import callback
+from homeassistant.helpers import selector
+
+from .battery import BatteryPlanner
+from .const import BIDDING_ZONES, DEFAULT_ZONE, DOMAIN
+from .tariff import TariffProfile, parse_grid_fees
+
+
+def _grid_fees(value):
+    try:
+        parse_grid_fees(value)
+    except ValueError as err:
+        raise vol.Invalid(f"Invalid grid fees, expected HH:MM-HH:MM=fee; ...: {err}") from err
+    return value
 
-from .const import DOMAIN
 
 class Frank2ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
     async def async_step_user(self, user_input=None):
         if user_input is not None:
-            return self.async_create_entry(title="Frank2", data=user_input)
+            return self.async_create_entry(title=f"Frank2 {BIDDING_ZONES[user_input['zone']]}", data=user_input)
 
         return self.async_show_form(
             step_id="user",
             data_schema=vol.Schema({
                 vol.Required("token"): str,
+                vol.Required("zone", default=DEFAULT_ZONE): vol.In(BIDDING_ZONES),
                 vol.Required("inkoop", default=0.01815): vol.Coerce(float),
                 vol.Required("eb", default=0.1108): vol.Coerce(float),
                 vol.Required("btw", default=21.0): vol.Coerce(float),
+                vol.Optional("grid_fees", default=""): vol.All(str, _grid_fees),
+                vol.Required("feed_in_cost", default=0.0): vol.Coerce(float),
+                vol.Required("feed_in_vat", default=False): bool,
+                vol.Required("netting", default=True): bool,
                 vol.Required("lowest_periods_count", default=14): vol.All(vol.Coerce(int), vol.Range(min=4, max=24)),
                 vol.Required("highest_periods_count", default=8): vol.All(vol.Coerce(int), vol.Range(min=4, max=24)),
+                vol.Required("window_duration", default=120): vol.All(vol.Coerce(int), vol.Range(min=15, max=720)),
+                vol.Required("battery_capacity", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required("battery_charge_power", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required("battery_discharge_power", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required("battery_efficiency", default=90.0): vol.All(vol.Coerce(float), vol.Range(min=1, max=100)),
+                vol.Optional("battery_soc_entity"): selector.EntitySelector(selector.EntitySelectorConfig(domain="sensor")),
+                vol.Required("percentile_threshold", default=20): vol.All(vol.Coerce(int), vol.Range(min=1, max=99)),
+                vol.Required("price_list_attributes", default=False): bool,
             })
         )
 
@@ -34,9 +59,21 @@ class Frank2OptionsFlow(config_entries.OptionsFlow):
     async def async_step_init(self, user_input=None):
         if user_input is not None:
             new_data = self.config_entry.data.copy()
+            # A cleared entity selector is left out of user_input
+            new_data.pop("battery_soc_entity", None)
             new_data.update(user_input)
             self.hass.config_entries.async_update_entry(self.config_entry, data=new_data)
-            await self.hass.config_entries.async_reload(self.config_entry.entry_id)
+            if self.config_entry.state is config_entries.ConfigEntryState.LOADED:
+                # Only tariff, count, window, battery, percentile and attribute options exist, apply them to the cached prices instead of reloading
+                coordinator = self.config_entry.runtime_data
+                await coordinator.async_set_tariff(TariffProfile.from_entry_data(new_data))
+                await coordinator.async_set_period_counts(
+                    new_data["lowest_periods_count"], new_data["highest_periods_count"]
+                )
+                coordinator.async_set_window_duration(new_data["window_duration"])
+                await coordinator.async_set_battery(BatteryPlanner.from_entry_data(new_data))
+                coordinator.async_set_percentile_threshold(new_data["percentile_threshold"])
+                coordinator.async_set_price_list_attributes(new_data["price_list_attributes"])
             return self.async_abort(reason="reconfigure_successful")
 
         return self.async_show_form(
@@ -45,7 +82,19 @@ class Frank2OptionsFlow(config_entries.OptionsFlow):
                 vol.Required("inkoop", default=self.config_entry.data.get("inkoop", 0.01815)): vol.Coerce(float),
                 vol.Required("eb", default=self.config_entry.data.get("eb", 0.1108)): vol.Coerce(float),
                 vol.Required("btw", default=self.config_entry.data.get("btw", 21.0)): vol.Coerce(float),
+                vol.Optional("grid_fees", default=self.config_entry.data.get("grid_fees", "")): vol.All(str, _grid_fees),
+                vol.Required("feed_in_cost", default=self.config_entry.data.get("feed_in_cost", 0.0)): vol.Coerce(float),
+                vol.Required("feed_in_vat", default=self.config_entry.data.get("feed_in_vat", False)): bool,
+                vol.Required("netting", default=self.config_entry.data.get("netting", True)): bool,
                 vol.Required("lowest_periods_count", default=self.config_entry.data.get("lowest_periods_count", 14)): vol.All(vol.Coerce(int), vol.Range(min=4, max=24)),
                 vol.Required("highest_periods_count", default=self.config_entry.data.get("highest_periods_count", 8)): vol.All(vol.Coerce(int), vol.Range(min=4, max=24)),
+                vol.Required("window_duration", default=self.config_entry.data.get("window_duration", 120)): vol.All(vol.Coerce(int), vol.Range(min=15, max=720)),
+                vol.Required("battery_capacity", default=self.config_entry.data.get("battery_capacity", 0.0)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required("battery_charge_power", default=self.config_entry.data.get("battery_charge_power", 0.0)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required("battery_discharge_power", default=self.config_entry.data.get("battery_discharge_power", 0.0)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required("battery_efficiency", default=self.config_entry.data.get("battery_efficiency", 90.0)): vol.All(vol.Coerce(float), vol.Range(min=1, max=100)),
+                vol.Optional("battery_soc_entity", description={"suggested_value": self.config_entry.data.get("battery_soc_entity")}): selector.EntitySelector(selector.EntitySelectorConfig(domain="sensor")),
+                vol.Required("percentile_threshold", default=self.config_entry.data.get("percentile_threshold", 20)): vol.All(vol.Coerce(int), vol.Range(min=1, max=99)),
+                vol.Required("price_list_attributes", default=self.config_entry.data.get("price_list_attributes", False)): bool,
             })
         )
\ No newline at end of file
@@ -1 +1,45 @@
-DOMAIN = "frank2"
\ No newline at end of file
+from datetime import time, timedelta
+
+DOMAIN = "frank2"
+
+DEFAULT_ZONE = "10YNL----------L"
+# ENTSO-E bidding zone EIC codes
+BIDDING_ZONES = {
+    "10YNL----------L": "NL",
+    "10YBE----------2": "BE",
+    "10Y1001A1001A82H": "DE-LU",
+    "10YFR-RTE------C": "FR",
+    "10YAT-APG------L": "AT",
+    "10YCH-SWISSGRIDZ": "CH",
+    "10YPL-AREA-----S": "PL",
+    "10YDK-1--------W": "DK1",
+    "10YDK-2--------M": "DK2",
+}
+
+API_URL = "https://web-api.tp.entsoe.eu/api"
+REQUEST_TIMEOUT = 30
+# Shared by every zone, ENTSO-E allows 400 requests per minute
+MAX_PARALLEL_REQUESTS = 4
+MIN_REQUEST_INTERVAL = 0.2
+
+# Day-ahead prices for tomorrow are published around noon local market time
+PUBLICATION_TIME = time(12, 45)
+# Backoff while published prices are still missing
+RETRY_MIN_INTERVAL = timedelta(minutes=2)
+RETRY_MAX_INTERVAL = timedelta(minutes=30)
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+
+# Seconds to wait for a period count slider to settle before recomputing
+PERIODS_COUNT_DEBOUNCE = 1.5
+# Archive backfill requests cover at most this many days and run this many at a time
+ARCHIVE_CHUNK_DAYS = 31
+ARCHIVE_PARALLEL_CHUNKS = 3
+
+# Days of archived prices the history percentile compares against
+HISTORY_DAYS = 30
+
+# Days of archived prices the forecaster is trained on, and the last day it forecasts (today + n)
+FORECAST_TRAINING_DAYS = 90
+FORECAST_HORIZON_DAYS = 2
@@ -1,81 +1,311 @@
+import asyncio
 import logging
+from array import array
 from datetime import datetime, timedelta
 
-import aiohttp
-import xml.etree.ElementTree as ET
-
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    FORECAST_HORIZON_DAYS,
+    FORECAST_TRAINING_DAYS,
+    HISTORY_DAYS,
+    PUBLICATION_TIME,
+    RETRY_MAX_INTERVAL,
+    RETRY_MIN_INTERVAL,
+)
+from .forecast import PriceForecaster, day_profiles
+from .prices import HOUR_SECONDS, SLOT_SECONDS, PriceSnapshot
 
 _LOGGER = logging.getLogger(__name__)
 
+def get_coordinator(hass, config_entry_id=None):
+    """Coordinator of the given config entry, or of the first loaded one."""
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.state is not ConfigEntryState.LOADED:
+            continue
+        if config_entry_id is None or entry.entry_id == config_entry_id:
+            return entry.runtime_data
+    return None
+
 class Frank2Coordinator(DataUpdateCoordinator):
-    def __init__(self, hass, token, domain, inkoop, eb, btw):
-        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=timedelta(hours=1))
-        self.token = token
-        self.domain = domain
-        self.inkoop = inkoop
-        self.eb = eb
-        self.btw = btw
+    def __init__(self, hass, source, tariff, lowest_periods_count=14, highest_periods_count=8,
+                 window_duration=120, battery=None, percentile_threshold=20, price_list_attributes=False):
+        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=RETRY_MIN_INTERVAL)
+        # Net prices of the bidding zone, shared with other entries on the same zone
+        self.source = source
+        self.tariff = tariff
+        self.lowest_periods_count = lowest_periods_count
+        self.highest_periods_count = highest_periods_count
+        # Minutes covered by the cheapest/most expensive window sensors
+        self.window_duration = window_duration
+        # Optional BatteryPlanner, its policy is solved with every snapshot
+        self.battery = battery
+        self.battery_policy = None
+        self.percentile_threshold = percentile_threshold
+        # Also list every slot in entity attributes instead of only summarizing them
+        self.price_list_attributes = price_list_attributes
+        self._history = None
+        self._history_key = None
+        # Snapshot of forecast prices for the days up to FORECAST_HORIZON_DAYS without published prices
+        self.forecast = None
+        self.forecaster = PriceForecaster()
+        self._profiles = {}
+        self._forecast_key = None
+        self.snapshot = PriceSnapshot({}, lowest_periods_count, highest_periods_count)
+        # All-in series per delivery day, rebuilt when the source or tariff changes
+        self._cache = {}
+        self._cache_sources = {}
+        self._retry_interval = RETRY_MIN_INTERVAL
+        # One sync -> build -> publish run at a time, so a slow run never publishes over a newer one
+        self._pipeline = asyncio.Lock()
+        self._tick_listeners = []
+        self._unsub_tick = None
+        # Entity state writes done and skipped because nothing changed
+        self.state_writes = 0
+        self.skipped_state_writes = 0
 
-    async def _async_update_data(self):
-        today = datetime.utcnow().date()
-        tomorrow = today + timedelta(days=1)
-        data = {}
-        ns = {'ns': 'urn:iec62325.351:tc57wg16:451-3:publicationdocument:7:3'}
-        for date in [today, tomorrow]:
-            date_str = date.strftime("%Y%m%d")
-            next_date_str = (date + timedelta(days=1)).strftime("%Y%m%d")
-            url = f"https://web-api.tp.entsoe.eu/api?securityToken={self.token}&documentType=A44&in_Domain={self.domain}&out_Domain={self.domain}&periodStart={date_str}0000&periodEnd={next_date_str}0000"
+    def _build_cache(self, days, sources, cache, tariff):
+        return {
+            date_str: cache[date_str] if sources.get(date_str) is net else tariff.apply(net)
+            for date_str, net in days.items()
+        }
+
+    async def _async_sync_cache(self, rebuild=False):
+        """Apply the tariff to the source days that changed since the last sync, holding the pipeline lock."""
+        sources = {} if rebuild else self._cache_sources
+        days = dict(self.source.days)
+        self._cache = await self.hass.async_add_executor_job(
+            self._build_cache, days, sources, self._cache, self.tariff
+        )
+        self._cache_sources = days
+
+    def _build_history(self, tariff):
+        """Sorted all-in prices of the archived HISTORY_DAYS before today, rebuilt when the archive or tariff changed."""
+        today = dt_util.start_of_local_day()
+        start = dt_util.start_of_local_day(today.date() - timedelta(days=HISTORY_DAYS))
+        key = (self.source.archive.end, tariff, start)
+        if key != self._history_key:
+            records = self.source.archive.records(start.timestamp(), today.timestamp())
+            self._history = array("d", sorted(tariff.apply_records(records)))
+            self._history_key = key
+        return self._history
+
+    def _build_forecast(self, data, tariff, lowest_count, highest_count):
+        """Forecast snapshot for the coming days without prices, retrained when the archive grew."""
+        today = dt_util.now().date()
+        key = (self.source.archive.end, today)
+        if key != self._forecast_key:
+            start = dt_util.start_of_local_day(today - timedelta(days=FORECAST_TRAINING_DAYS))
+            records = self.source.archive.records(start.timestamp(), dt_util.start_of_local_day(today).timestamp())
+            self._profiles = day_profiles(records)
+            self.forecaster.fit(self._profiles)
+            self._forecast_key = key
+        profiles = dict(self._profiles)
+        profiles.update(day_profiles(
+            (series.start_at(i), series.resolution, price)
+            for series in data.values()
+            for i, price in enumerate(series.net_prices)
+        ))
+        dates = [today + timedelta(days=offset) for offset in range(FORECAST_HORIZON_DAYS + 1)]
+        days = self.forecaster.forecast(profiles, [date for date in dates if date.strftime("%Y%m%d") not in data])
+        if not days:
+            return None
+        return PriceSnapshot(
+            {date_str: tariff.apply(series) for date_str, series in days.items()},
+            lowest_count, highest_count
+        )
+
+    def _build_snapshot(self, data, tariff, lowest_count, highest_count, battery):
+        """Everything published with a refresh, runs in the executor on the arguments only.
+
+        The history and forecast caches it updates are only touched with the
+        pipeline lock held.
+        """
+        snapshot = PriceSnapshot(data, lowest_count, highest_count, self._build_history(tariff))
+        # Built here so the hourly sensors only read it on the event loop
+        snapshot.resampled(HOUR_SECONDS)
+        return (
+            snapshot,
+            None if battery is None else battery.solve(snapshot),
+            self._build_forecast(data, tariff, lowest_count, highest_count),
+        )
+
+    async def _async_build_and_publish(self, data):
+        self._publish_snapshot(*await self.hass.async_add_executor_job(
+            self._build_snapshot, data, self.tariff, self.lowest_periods_count, self.highest_periods_count,
+            self.battery
+        ))
+
+    async def async_load_cache(self):
+        """Load cached prices so entities have data before any network I/O."""
+        await self.source.async_load()
+        async with self._pipeline:
+            await self._async_sync_cache()
+            data = self._current_days()
+            if data:
+                _LOGGER.debug(f"Loaded cached data for {list(data)}")
+                await self._async_build_and_publish(data)
+                self.data = data
+        return data
+
+    def _current_days(self):
+        today = dt_util.now().date()
+        keys = [(today + timedelta(days=offset)).strftime("%Y%m%d") for offset in (0, 1)]
+        return {key: self._cache[key] for key in keys if key in self._cache}
+
+    def _next_update_interval(self, now):
+        """Poll with backoff while published prices are missing, otherwise sleep until the next publication."""
+        today = now.date()
+        published = now.time() >= PUBLICATION_TIME
+        complete = self.source.is_complete
+        if complete(today) and (complete(today + timedelta(days=1)) or not published):
+            self._retry_interval = RETRY_MIN_INTERVAL
+            publication_day = today + timedelta(days=1) if published else today
+            publication = datetime.combine(publication_day, PUBLICATION_TIME, dt_util.get_default_time_zone())
+            return publication - now
+        interval = self._retry_interval
+        self._retry_interval = min(interval * 2, RETRY_MAX_INTERVAL)
+        return interval
+
+    @callback
+    def async_add_tick_listener(self, update_callback):
+        """Call update_callback at every slot boundary, from cached data only."""
+        self._tick_listeners.append(update_callback)
+        if self._unsub_tick is None:
+            self._schedule_tick()
+
+        @callback
+        def remove_listener():
+            self._tick_listeners.remove(update_callback)
+            if not self._tick_listeners and self._unsub_tick is not None:
+                self._unsub_tick()
+                self._unsub_tick = None
+
+        return remove_listener
+
+    @callback
+    def _schedule_tick(self):
+        if self._unsub_tick is not None:
+            self._unsub_tick()
+        now = dt_util.utcnow().timestamp()
+        boundary = self.snapshot.index.next_boundary(now)
+        if boundary is None:
+            boundary = now - now % SLOT_SECONDS + SLOT_SECONDS
+        self._unsub_tick = async_track_point_in_utc_time(
+            self.hass, self._async_handle_tick, dt_util.utc_from_timestamp(boundary)
+        )
+
+    @callback
+    def _async_handle_tick(self, now):
+        self._unsub_tick = None
+        for update_callback in list(self._tick_listeners):
+            update_callback()
+        self._schedule_tick()
+
+    async def async_set_tariff(self, tariff):
+        """Recompute all-in prices from the cached net prices, without fetching."""
+        if tariff == self.tariff:
+            return
+        async with self._pipeline:
+            self.tariff = tariff
+            await self._async_sync_cache(rebuild=True)
+            await self._async_recompute()
+
+    async def async_set_period_counts(self, lowest_periods_count=None, highest_periods_count=None):
+        """Recompute the lowest/highest selections from the cached series, without fetching."""
+        if lowest_periods_count is not None:
+            self.lowest_periods_count = lowest_periods_count
+        if highest_periods_count is not None:
+            self.highest_periods_count = highest_periods_count
+        async with self._pipeline:
+            if (self.snapshot.lowest_count, self.snapshot.highest_count) != (
+                self.lowest_periods_count, self.highest_periods_count
+            ):
+                await self._async_recompute()
+
+    @callback
+    def async_set_window_duration(self, window_duration):
+        """Windows are computed on demand from the snapshot, only the entities need updating."""
+        if window_duration != self.window_duration:
+            self.window_duration = window_duration
+            self.async_update_listeners()
+
+    @callback
+    def async_set_percentile_threshold(self, percentile_threshold):
+        if percentile_threshold != self.percentile_threshold:
+            self.percentile_threshold = percentile_threshold
+            self.async_update_listeners()
+
+    @callback
+    def async_set_price_list_attributes(self, price_list_attributes):
+        if price_list_attributes != self.price_list_attributes:
+            self.price_list_attributes = price_list_attributes
+            self.async_update_listeners()
+
+    async def async_set_battery(self, battery):
+        """Replace the battery planner and solve it for the current snapshot."""
+        async with self._pipeline:
+            self.battery = battery
+            policy = None
+            if battery is not None:
+                policy = await self.hass.async_add_executor_job(battery.solve, self.snapshot)
+            self.battery_policy = policy
+        self.async_update_listeners()
+
+    def resample(self, resolution, how="mean"):
+        """Current prices aggregated to resolution seconds with "mean", "min" or "max", cached per snapshot."""
+        return self.snapshot.resampled(resolution, how)
+
+    @callback
+    def battery_plan(self):
+        """Plan from the current slot and state of charge, None without a battery."""
+        battery = self.battery
+        if battery is None:
+            return None
+        soc = None
+        if battery.soc_entity:
+            state = self.hass.states.get(battery.soc_entity)
             try:
-                _LOGGER.debug(f"Fetching data for {date_str} from {url}")
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as resp:
-                        _LOGGER.debug(f"Response status for {date_str}: {resp.status}")
-                        if resp.status != 200:
-                            _LOGGER.warning(f"Failed to fetch data for {date_str}: {resp.status}")
-                            continue
-                        xml = await resp.text()
-                _LOGGER.debug(f"XML received for {date_str}: {xml[:500]}...")  # Log first 500 chars
-                root = ET.fromstring(xml)
-                time_series_list = root.findall(".//ns:TimeSeries", ns)
-                _LOGGER.debug(f"Found {len(time_series_list)} TimeSeries for {date_str}")
-                if not time_series_list:
-                    _LOGGER.debug(f"No TimeSeries found in XML for {date_str}")
-                    continue
-                time_series = time_series_list[0]
-                time_interval = time_series.find(".//ns:timeInterval", ns)
-                if time_interval is None:
-                    _LOGGER.debug(f"No timeInterval found in XML for {date_str}")
-                    continue
-                start = time_interval.find("ns:start", ns).text
-                start_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                points = []
-                for point in time_series.findall(".//ns:Point", ns):
-                    position = int(point.find("ns:position", ns).text)
-                    price_elem = point.find("ns:price.amount", ns)
-                    if price_elem is None:
-                        continue
-                    price = float(price_elem.text)
-                    minutes = (position - 1) * 15
-                    start_time = start_dt + timedelta(minutes=minutes)
-                    end_time = start_time + timedelta(minutes=15)
-                    price_kwh = price / 1000
-                    allin = (price_kwh) * (1 + self.btw / 100) + self.inkoop + self.eb
-                    local_tz = dt_util.get_default_time_zone()
-                    start_dt_local = dt_util.as_local(start_time)
-                    end_dt_local = dt_util.as_local(end_time)
-                    points.append({
-                        "start": start_dt_local.isoformat(),
-                        "end": end_dt_local.isoformat(),
-                        "price": round(allin, 5),
-                        "net_price": round(price_kwh, 5)
-                    })
-                _LOGGER.debug(f"Found {len(points)} points for {date_str}")
-                data[date_str] = points
-            except Exception as e:
-                _LOGGER.error(f"Error fetching data for {date_str}: {e}")
-        _LOGGER.debug(f"Final data: {data}")
-        return data
\ No newline at end of file
+                soc = float(state.state)
+            except (AttributeError, ValueError):
+                _LOGGER.debug(f"No state of charge from {battery.soc_entity}, using the planned one")
+        return battery.plan(self.battery_policy, soc)
+
+    async def _async_recompute(self):
+        """Rebuild the snapshot from the cached series, the caller holds the pipeline lock."""
+        data = self._current_days()
+        await self._async_build_and_publish(data)
+        self.data = data
+        self.async_update_listeners()
+
+    @callback
+    def _publish_snapshot(self, snapshot, battery_policy=None, forecast=None):
+        self.snapshot = snapshot
+        self.battery_policy = battery_policy
+        self.forecast = forecast
+        if self._tick_listeners:
+            self._schedule_tick()
+
+    async def _async_update_data(self):
+        # fetch (shared per zone) -> apply tariff -> build snapshot -> publish,
+        # the CPU bound stages run in the executor on values captured under the pipeline lock
+        now = dt_util.now()
+        today = now.date()
+        dates = [today]
+        # Tomorrow's prices do not exist before the day-ahead auction is published
+        if now.time() >= PUBLICATION_TIME:
+            dates.append(today + timedelta(days=1))
+        await self.source.async_ensure_days(dates)
+        async with self._pipeline:
+            await self._async_sync_cache()
+            data = self._current_days()
+            self.update_interval = self._next_update_interval(now)
+            _LOGGER.debug(f"Next update in {self.update_interval}")
+            _LOGGER.debug(f"Final data: { {date_str: len(series) for date_str, series in data.items()} }")
+            await self._async_build_and_publish(data)
+        return data
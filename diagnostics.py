@@ -0,0 +1,16 @@
+from homeassistant.components.diagnostics import async_redact_data
+
+TO_REDACT = {"token"}
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    coordinator = entry.runtime_data
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "zone": coordinator.source.zone,
+        "days": {date_str: len(series) for date_str, series in (coordinator.data or {}).items()},
+        "state_writes": coordinator.state_writes,
+        "skipped_state_writes": coordinator.skipped_state_writes,
+        "archive_records": await hass.async_add_executor_job(len, coordinator.source.archive),
+        "forecast_mae": coordinator.forecaster.mae,
+        "forecast_training_seconds": coordinator.forecaster.training_seconds,
+    }
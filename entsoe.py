@@ -0,0 +1,142 @@
+import re
+from array import array
+from datetime import datetime
+import xml.etree.ElementTree as ET
+
+_DURATION = re.compile(r"^PT(?:(\d+)H)?(?:(\d+)M)?$")
+
+
+def parse_resolution(text):
+    """Seconds per position for an ISO 8601 resolution such as PT15M or PT60M."""
+    match = _DURATION.match(text.strip())
+    if not match or not any(match.groups()):
+        raise ValueError(f"Unsupported resolution {text}")
+    hours, minutes = match.groups()
+    return int(hours or 0) * 3600 + int(minutes or 0) * 60
+
+
+def _tag(elem):
+    return elem.tag.rpartition("}")[2]
+
+
+class Period:
+    """One Period block of an A44 TimeSeries, positions and amounts as sent."""
+
+    __slots__ = ("time_series", "curve_type", "start", "end", "resolution", "positions", "amounts")
+
+    def __init__(self, time_series, curve_type):
+        self.time_series = time_series
+        self.curve_type = curve_type
+        self.start = None
+        self.end = None
+        self.resolution = None
+        self.positions = array("i")
+        self.amounts = array("d")
+
+    def __len__(self):
+        return len(self.positions)
+
+
+class A44Parser:
+    """Incremental parser for ENTSO-E A44 (day-ahead price) documents.
+
+    Bytes are fed as they arrive from the network. Points are appended to the
+    current Period as soon as their element closes and the XML elements are
+    dropped right away, so memory stays proportional to the number of prices
+    instead of the size of the document.
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._time_series = 0
+        self._curve_type = None
+        self._period = None
+        self._position = None
+        self._amount = None
+        self.periods = []
+
+    @property
+    def points(self):
+        return sum(len(period) for period in self.periods)
+
+    def feed(self, data):
+        """Feed a chunk of the document, returns the number of points read from it."""
+        self._parser.feed(data)
+        return self._read_events()
+
+    def close(self):
+        self._parser.close()
+        return self._read_events()
+
+    def _read_events(self):
+        count = 0
+        for event, elem in self._parser.read_events():
+            tag = _tag(elem)
+            if event == "start":
+                if tag == "Period":
+                    self._period = Period(self._time_series, self._curve_type)
+                    self.periods.append(self._period)
+                continue
+            if tag == "position":
+                self._position = int(elem.text)
+            elif tag == "price.amount":
+                self._amount = float(elem.text)
+            elif tag == "Point":
+                if self._period is not None and self._position is not None and self._amount is not None:
+                    self._period.positions.append(self._position)
+                    self._period.amounts.append(self._amount)
+                    count += 1
+                self._position = self._amount = None
+                elem.clear()
+            elif tag == "start" and self._period is not None and self._period.start is None:
+                self._period.start = datetime.fromisoformat(elem.text.replace("Z", "+00:00")).timestamp()
+            elif tag == "end" and self._period is not None and self._period.end is None:
+                self._period.end = datetime.fromisoformat(elem.text.replace("Z", "+00:00")).timestamp()
+            elif tag == "resolution" and self._period is not None:
+                self._period.resolution = parse_resolution(elem.text)
+            elif tag == "curveType":
+                self._curve_type = elem.text
+            elif tag == "Period":
+                elem.clear()
+                self._period = None
+            elif tag == "TimeSeries":
+                elem.clear()
+                self._time_series += 1
+                self._curve_type = None
+        return count
+
+
+def expand_period(period, resolution):
+    """Slot starts and prices (EUR/MWh) of a period at a resolution dividing its own.
+
+    Curve type A03 omits positions whose price did not change, they repeat the
+    previous position up to the end of the period. Other curve types send
+    every position, missing ones stay gaps.
+    """
+    period_resolution = period.resolution or resolution
+    if period.start is None or period_resolution % resolution:
+        return [], []
+    if period.end is not None:
+        count = int(period.end - period.start) // period_resolution
+    else:
+        count = max(period.positions, default=0)
+    values = [None] * count
+    for position, amount in zip(period.positions, period.amounts):
+        if 0 < position <= count:
+            values[position - 1] = amount
+    if period.curve_type == "A03":
+        previous = None
+        for i, value in enumerate(values):
+            if value is None:
+                values[i] = previous
+            else:
+                previous = value
+    factor = period_resolution // resolution
+    start = int(period.start)
+    starts = [
+        start + i * period_resolution + k * resolution
+        for i, value in enumerate(values) if value is not None
+        for k in range(factor)
+    ]
+    prices = [value for value in values if value is not None for _ in range(factor)]
+    return starts, prices
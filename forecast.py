@@ -0,0 +1,173 @@
+import time
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from .prices import SLOT_SECONDS, PriceSeries
+
+SLOTS_PER_DAY = 24 * 3600 // SLOT_SECONDS
+RIDGE_ALPHA = 1.0
+# Most recent days held out of training to measure the forecast error
+HOLDOUT_DAYS = 7
+
+# Feature layout: hour of day one-hot, weekday one-hot, then the dense features
+_WEEKDAY = 24
+_LAG_DAY = _WEEKDAY + 7
+_LAG_WEEK = _LAG_DAY + 1
+_LEVEL = _LAG_WEEK + 1
+FEATURES = _LEVEL + 1
+
+
+def day_profiles(slots):
+    """Net price per local date and quarter hour of the day from (start, seconds, price) slots.
+
+    Longer slots fill each quarter hour they cover, the repeated hour of a DST
+    change keeps its last value.
+    """
+    tz = dt_util.get_default_time_zone()
+    profiles = {}
+    for start, seconds, price in slots:
+        for t in range(start, start + seconds, SLOT_SECONDS):
+            local = datetime.fromtimestamp(t, tz)
+            profile = profiles.get(local.date())
+            if profile is None:
+                profile = profiles[local.date()] = [None] * SLOTS_PER_DAY
+            profile[(local.hour * 3600 + local.minute * 60) // SLOT_SECONDS] = price
+    return profiles
+
+
+def _mean(values):
+    values = [value for value in values if value is not None]
+    return sum(values) / len(values) if values else None
+
+
+def _features(date, q, previous, week_before, level):
+    """Non-zero (index, value) features of quarter hour q on date, None without the previous day.
+
+    level is the mean price of the previous day, computed once per day by the caller.
+    """
+    lag_day = previous[q] if previous[q] is not None else level
+    if lag_day is None:
+        return None
+    lag_week = week_before[q] if week_before is not None and week_before[q] is not None else lag_day
+    return [
+        (q * SLOT_SECONDS // 3600, 1.0),
+        (_WEEKDAY + date.weekday(), 1.0),
+        (_LAG_DAY, lag_day),
+        (_LAG_WEEK, lag_week),
+        (_LEVEL, level),
+    ]
+
+
+def _solve(a, b):
+    """Solve a x = b by Gaussian elimination with partial pivoting, a is modified."""
+    n = len(b)
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda row: abs(a[row][col]))
+        a[col], a[pivot] = a[pivot], a[col]
+        b[col], b[pivot] = b[pivot], b[col]
+        for row in range(col + 1, n):
+            factor = a[row][col] / a[col][col]
+            if factor:
+                a_row, a_col = a[row], a[col]
+                for k in range(col, n):
+                    a_row[k] -= factor * a_col[k]
+                b[row] -= factor * b[col]
+    x = [0.0] * n
+    for row in range(n - 1, -1, -1):
+        x[row] = (b[row] - sum(a[row][k] * x[k] for k in range(row + 1, n))) / a[row][row]
+    return x
+
+
+class PriceForecaster:
+    """Ridge regression of quarter hour prices on time of day, weekday and the days before.
+
+    Rows are sparse, so the normal equations are accumulated from five
+    non-zero features per sample instead of a dense design matrix.
+    """
+
+    def __init__(self, alpha=RIDGE_ALPHA):
+        self.alpha = alpha
+        self.weights = None
+        self.mae = None
+        self.training_seconds = None
+
+    def _fit(self, profiles, dates):
+        xtx = [[self.alpha if i == j else 0.0 for j in range(FEATURES)] for i in range(FEATURES)]
+        xty = [0.0] * FEATURES
+        samples = 0
+        for date in dates:
+            previous = profiles.get(date - timedelta(days=1))
+            if previous is None:
+                continue
+            week_before = profiles.get(date - timedelta(days=7))
+            level = _mean(previous)
+            for q, price in enumerate(profiles[date]):
+                if price is None:
+                    continue
+                row = _features(date, q, previous, week_before, level)
+                if row is None:
+                    continue
+                for i, x_i in row:
+                    xty[i] += x_i * price
+                    xtx_i = xtx[i]
+                    for j, x_j in row:
+                        xtx_i[j] += x_i * x_j
+                samples += 1
+        return _solve(xtx, xty) if samples else None
+
+    def _predict(self, weights, profiles, date):
+        previous = profiles[date - timedelta(days=1)]
+        week_before = profiles.get(date - timedelta(days=7))
+        level = _mean(previous)
+        profile = []
+        for q in range(SLOTS_PER_DAY):
+            row = _features(date, q, previous, week_before, level)
+            profile.append(None if row is None else sum(weights[i] * x for i, x in row))
+        return profile
+
+    def fit(self, profiles):
+        """Train on every day, after measuring the error on the last HOLDOUT_DAYS days."""
+        started = time.perf_counter()
+        dates = sorted(profiles)
+        train, holdout = dates[:-HOLDOUT_DAYS], dates[-HOLDOUT_DAYS:]
+        weights = self._fit(profiles, train) if len(train) > HOLDOUT_DAYS else None
+        # No error from an earlier fit survives a fit that cannot measure one
+        self.mae = None
+        if weights is not None:
+            errors = []
+            for date in holdout:
+                if date - timedelta(days=1) not in profiles:
+                    continue
+                predicted = self._predict(weights, profiles, date)
+                errors.extend(
+                    abs(p - a) for p, a in zip(predicted, profiles[date]) if p is not None and a is not None
+                )
+            self.mae = round(sum(errors) / len(errors), 5) if errors else None
+        self.weights = self._fit(profiles, dates)
+        self.training_seconds = round(time.perf_counter() - started, 3)
+        return self.weights is not None
+
+    def forecast(self, profiles, dates):
+        """Net price series per YYYYMMDD for the given local dates, each predicted from the day before.
+
+        Dates without prices use the forecast of the days before them.
+        """
+        if self.weights is None:
+            return {}
+        profiles = dict(profiles)
+        result = {}
+        for date in sorted(dates):
+            if date - timedelta(days=1) not in profiles:
+                continue
+            profile = profiles[date] = self._predict(self.weights, profiles, date)
+            start = dt_util.start_of_local_day(date)
+            end = dt_util.start_of_local_day(date + timedelta(days=1))
+            tz = dt_util.get_default_time_zone()
+            series = PriceSeries(start.timestamp(), SLOT_SECONDS)
+            for t in range(int(start.timestamp()), int(end.timestamp()), SLOT_SECONDS):
+                local = datetime.fromtimestamp(t, tz)
+                price = profile[(local.hour * 3600 + local.minute * 60) // SLOT_SECONDS]
+                series.append(price, price)
+            result[date.strftime("%Y%m%d")] = series
+        return result
@@ -1,7 +1,8 @@
 from homeassistant.components.number import NumberEntity
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, PERIODS_COUNT_DEBOUNCE
 
 import logging
 
@@ -14,11 +15,16 @@ async def async_setup_entry(hass, entry, async_add_entities):
         Frank2HighestPeriodsCount(coordinator, entry)
     ])
 
-class Frank2LowestPeriodsCount(NumberEntity):
+class Frank2LowestPeriodsCount(CoordinatorEntity, NumberEntity):
     def __init__(self, coordinator, entry):
-        self.coordinator = coordinator
+        super().__init__(coordinator)
         self._entry = entry
-        self._value = entry.data.get("lowest_periods_count", 14)
+        # Value set from the UI that has not been applied yet
+        self._value = None
+        self._debouncer = Debouncer(
+            coordinator.hass, _LOGGER, cooldown=PERIODS_COUNT_DEBOUNCE, immediate=False,
+            function=self._async_apply_value
+        )
 
     @property
     def name(self):
@@ -30,7 +36,9 @@ class Frank2LowestPeriodsCount(NumberEntity):
 
     @property
     def native_value(self):
-        return self._value
+        if self._value is not None:
+            return self._value
+        return self.coordinator.lowest_periods_count
 
     @property
     def native_min_value(self):
@@ -46,16 +54,33 @@ class Frank2LowestPeriodsCount(NumberEntity):
 
     async def async_set_native_value(self, value):
         self._value = int(value)
+        self.async_write_ha_state()
+        await self._debouncer.async_call()
+
+    async def _async_apply_value(self):
+        if self._value is None:
+            return
         new_data = self._entry.data.copy()
         new_data["lowest_periods_count"] = self._value
         self.coordinator.hass.config_entries.async_update_entry(self._entry, data=new_data)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_period_counts(lowest_periods_count=self._value)
+        self._value = None
+
+    async def async_will_remove_from_hass(self):
+        self._debouncer.async_cancel()
+        await self._async_apply_value()
+        await super().async_will_remove_from_hass()
 
-class Frank2HighestPeriodsCount(NumberEntity):
+class Frank2HighestPeriodsCount(CoordinatorEntity, NumberEntity):
     def __init__(self, coordinator, entry):
-        self.coordinator = coordinator
+        super().__init__(coordinator)
         self._entry = entry
-        self._value = entry.data.get("highest_periods_count", 8)
+        # Value set from the UI that has not been applied yet
+        self._value = None
+        self._debouncer = Debouncer(
+            coordinator.hass, _LOGGER, cooldown=PERIODS_COUNT_DEBOUNCE, immediate=False,
+            function=self._async_apply_value
+        )
 
     @property
     def name(self):
@@ -67,7 +92,9 @@ class Frank2HighestPeriodsCount(NumberEntity):
 
     @property
     def native_value(self):
-        return self._value
+        if self._value is not None:
+            return self._value
+        return self.coordinator.highest_periods_count
 
     @property
     def native_min_value(self):
@@ -83,7 +110,19 @@ class Frank2HighestPeriodsCount(NumberEntity):
 
     async def async_set_native_value(self, value):
         self._value = int(value)
+        self.async_write_ha_state()
+        await self._debouncer.async_call()
+
+    async def _async_apply_value(self):
+        if self._value is None:
+            return
         new_data = self._entry.data.copy()
         new_data["highest_periods_count"] = self._value
         self.coordinator.hass.config_entries.async_update_entry(self._entry, data=new_data)
-        await self.coordinator.async_request_refresh()
\ No newline at end of file
+        await self.coordinator.async_set_period_counts(highest_periods_count=self._value)
+        self._value = None
+
+    async def async_will_remove_from_hass(self):
+        self._debouncer.async_cancel()
+        await self._async_apply_value()
+        await super().async_will_remove_from_hass()
\ No newline at end of file
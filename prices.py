@@ -0,0 +1,651 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from heapq import heapify, heappop, heappush
+from datetime import datetime, timezone
+
+from homeassistant.util import dt as dt_util
+
+SLOT_SECONDS = 15 * 60
+# Resolution of the hourly sensor variants, resampled with every snapshot
+HOUR_SECONDS = 3600
+# Window lengths in seconds computed for every delivery day up front
+WINDOW_DURATIONS = (3600, 2 * 3600, 3 * 3600, 4 * 3600)
+
+
+def average(prices):
+    if not prices:
+        return None
+    return round(sum(prices) / len(prices), 5)
+
+
+# Aggregates available when resampling to a coarser resolution
+AGGREGATES = {"mean": average, "min": min, "max": max}
+
+
+def render_point(start, end, price, net_price):
+    """Render one slot the way it is exposed in entity attributes."""
+    tz = dt_util.get_default_time_zone()
+    return {
+        "start": datetime.fromtimestamp(start, tz).isoformat(),
+        "end": datetime.fromtimestamp(end, tz).isoformat(),
+        "price": price,
+        "net_price": net_price,
+    }
+
+
+def summarize_points(starts, prices):
+    """Small attribute payload describing slots instead of listing every one of them."""
+    if not prices:
+        return {"count": 0}
+    tz = dt_util.get_default_time_zone()
+    return {
+        "count": len(prices),
+        "min": min(prices),
+        "max": max(prices),
+        "first_start": datetime.fromtimestamp(min(starts), tz).isoformat(),
+        "last_start": datetime.fromtimestamp(max(starts), tz).isoformat(),
+    }
+
+
+class PriceSeries:
+    """Price slots of one resolution stored column-wise.
+
+    Slot i starts at start + i * resolution (UTC epoch seconds) while the
+    series is contiguous. A series with gaps also stores the start of every
+    slot. Prices are rounded the way they are published. All-in series of a
+    tariff without netting also hold the feed-in (sell) price of every slot.
+    """
+
+    __slots__ = ("start", "resolution", "prices", "net_prices", "_starts", "sell_prices")
+
+    def __init__(self, start, resolution=SLOT_SECONDS, prices=(), net_prices=(), starts=None, sell_prices=None):
+        self.start = int(start)
+        self.resolution = resolution
+        self.prices = array("d", prices)
+        self.net_prices = array("d", net_prices)
+        # Slot starts, only kept once the series has a gap
+        self._starts = None if starts is None else array("q", starts)
+        # Feed-in prices, None when they equal the all-in prices
+        self.sell_prices = None if sell_prices is None else array("d", sell_prices)
+
+    def __len__(self):
+        return len(self.prices)
+
+    @property
+    def dense(self):
+        return self._starts is None
+
+    @property
+    def starts(self):
+        if self._starts is None:
+            return range(self.start, self.end, self.resolution)
+        return self._starts
+
+    @property
+    def ends(self):
+        if self._starts is None:
+            return range(self.start + self.resolution, self.end + self.resolution, self.resolution)
+        return array("q", (start + self.resolution for start in self._starts))
+
+    @property
+    def end(self):
+        if self._starts:
+            return self._starts[-1] + self.resolution
+        return self.start + len(self.prices) * self.resolution
+
+    def append(self, price, net_price, start=None):
+        """Append a slot at the end of the series, or at a later start leaving a gap."""
+        if start is not None:
+            if not self.prices:
+                self.start = int(start)
+            elif start != self.end and self._starts is None:
+                self._starts = array("q", self.starts)
+        if self._starts is not None:
+            self._starts.append(self.end if start is None else start)
+        self.prices.append(round(price, 5))
+        self.net_prices.append(round(net_price, 5))
+
+    def start_at(self, i):
+        if self._starts is None:
+            return self.start + i * self.resolution
+        return self._starts[i]
+
+    @property
+    def version(self):
+        starts = b"" if self._starts is None else self._starts.tobytes()
+        sell_prices = b"" if self.sell_prices is None else self.sell_prices.tobytes()
+        return hash((self.start, self.resolution, starts, self.prices.tobytes(), self.net_prices.tobytes(),
+                     sell_prices))
+
+    def resample(self, resolution, how="mean", origin=None):
+        """Series aggregated into buckets of resolution seconds counted from origin.
+
+        origin defaults to the local midnight of the series start, so a day
+        missing its first slots still gets buckets aligned to the clock. The
+        resolution must be a multiple of the series resolution so every slot
+        falls in exactly one bucket, buckets without slots stay gaps. Returns
+        the series itself when it is not coarser than its own slots.
+        """
+        res = self.resolution
+        if resolution <= res:
+            return self
+        if resolution % res:
+            raise ValueError(f"Resolution {resolution}s is not a multiple of {res}s")
+        if origin is None:
+            origin = dt_util.start_of_local_day(
+                dt_util.as_local(datetime.fromtimestamp(self.start, timezone.utc))
+            ).timestamp()
+        origin = int(origin)
+        aggregate = AGGREGATES[how]
+        buckets = {}
+        for i, start in enumerate(self.starts):
+            buckets.setdefault((start - origin) // resolution, []).append(i)
+        series = PriceSeries(origin, resolution)
+        for bucket, indices in buckets.items():
+            series.append(
+                aggregate([self.prices[i] for i in indices]),
+                aggregate([self.net_prices[i] for i in indices]),
+                origin + bucket * resolution,
+            )
+        if self.sell_prices is not None:
+            series.sell_prices = array("d", [
+                round(aggregate([self.sell_prices[i] for i in indices]), 5) for indices in buckets.values()
+            ])
+        return series
+
+    def render(self, indices=None):
+        if indices is None:
+            indices = range(len(self.prices))
+        res = self.resolution
+        return [
+            render_point(self.start_at(i), self.start_at(i) + res, self.prices[i], self.net_prices[i])
+            for i in indices
+        ]
+
+
+def best_window(starts, ends, prices, lo, hi, duration, highest=False):
+    """Cheapest (or most expensive) run of contiguous slots in [lo, hi) covering duration seconds.
+
+    A single sliding sum over the slots, O(n). The run is the shortest one
+    starting at a slot that covers at least the duration, its average is
+    weighted by slot length. Returns (first, stop, average) or None.
+    """
+    best = None
+    total = 0.0
+    right = lo
+    for left in range(lo, hi):
+        if right <= left:
+            right = left
+            total = 0.0
+        while right < hi and (right == left or starts[right] == ends[right - 1]) \
+                and (right == left or ends[right - 1] - starts[left] < duration):
+            total += prices[right] * (ends[right] - starts[right])
+            right += 1
+        covered = ends[right - 1] - starts[left] if right > left else 0
+        if covered >= duration:
+            value = total / covered
+            if best is None or (value > best[2] if highest else value < best[2]):
+                best = (left, right, value)
+        if right > left:
+            total -= prices[left] * (ends[left] - starts[left])
+    if best is None:
+        return None
+    return best[0], best[1], round(best[2], 5)
+
+
+def render_window(start, end, average_price):
+    tz = dt_util.get_default_time_zone()
+    return {
+        "start": datetime.fromtimestamp(start, tz).isoformat(),
+        "end": datetime.fromtimestamp(end, tz).isoformat(),
+        "average": average_price,
+    }
+
+
+def rank(sorted_prices, price):
+    """(rank, percentile) of a price within a sorted array, rank 1 being the cheapest.
+
+    The percentile is the share of prices strictly below it.
+    """
+    if not sorted_prices or price is None:
+        return None
+    below = bisect_left(sorted_prices, price)
+    return below + 1, round(100 * below / len(sorted_prices), 1)
+
+
+def split_days(series_list):
+    """Split series into one PriceSeries per local delivery day, keyed YYYYMMDD.
+
+    Slots missing within a day leave a gap in its series, slots overlapping
+    earlier ones or of another resolution are dropped.
+    """
+    tz = dt_util.get_default_time_zone()
+    days = {}
+    for series in sorted(series_list, key=lambda series: series.start):
+        for i in range(len(series)):
+            start = series.start_at(i)
+            date_str = datetime.fromtimestamp(start, tz).strftime("%Y%m%d")
+            day = days.get(date_str)
+            if day is None:
+                day = days[date_str] = PriceSeries(start, series.resolution)
+            elif start < day.end or series.resolution != day.resolution:
+                continue
+            day.append(series.prices[i], series.net_prices[i], start)
+    return days
+
+
+def _timestamp(when):
+    if when is None:
+        return datetime.now(timezone.utc).timestamp()
+    if isinstance(when, datetime):
+        return when.timestamp()
+    return when
+
+
+class SlotIndex:
+    """Sorted slot start/end times answering "which slot is at t" by bisection.
+
+    Timestamps can be given as aware datetimes or epoch seconds and default to
+    now.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, starts, ends):
+        self.starts = starts
+        self.ends = ends
+
+    def __len__(self):
+        return len(self.starts)
+
+    def slot_at(self, when=None):
+        """Index of the slot containing the timestamp, or None."""
+        ts = _timestamp(when)
+        i = bisect_right(self.starts, ts) - 1
+        if i >= 0 and ts < self.ends[i]:
+            return i
+        return None
+
+    def current(self):
+        return self.slot_at()
+
+    def first_after(self, when=None):
+        """Index of the first slot that starts after the timestamp."""
+        return bisect_right(self.starts, _timestamp(when))
+
+    def next_boundary(self, when=None):
+        """Epoch of the next slot start or end after the timestamp, or None."""
+        ts = _timestamp(when)
+        i = bisect_right(self.starts, ts)
+        boundary = self.starts[i] if i < len(self.starts) else None
+        if i and ts < self.ends[i - 1] and (boundary is None or self.ends[i - 1] < boundary):
+            boundary = self.ends[i - 1]
+        return boundary
+
+    def future(self, when=None):
+        return range(self.first_after(when), len(self.starts))
+
+    def next_slots(self, count, when=None):
+        first = self.first_after(when)
+        return range(first, min(first + count, len(self.starts)))
+
+
+class LowestTracker:
+    """The count lowest prices among the slots from first onwards, kept up to date incrementally.
+
+    Selected slots sit in a max-heap, the others in a min-heap. Slots that
+    start before first are dropped lazily when they surface at the top of a
+    heap, so moving first forward or changing count only touches the slots
+    that enter or leave the selection. Ties rank by slot index, like a stable
+    sort on price.
+    """
+
+    def __init__(self, prices, count, first=0):
+        self._prices = prices
+        self.first = first
+        self.count = 0
+        self._candidates = [(prices[i], i) for i in range(first, len(prices))]
+        heapify(self._candidates)
+        self._selected = []
+        self._chosen = set()
+        self.resize(count)
+
+    def _pop_selected(self):
+        """Highest selected (price, index) that is still current, or None."""
+        while self._selected:
+            price, i = self._selected[0]
+            if -i in self._chosen:
+                return -price, -i
+            heappop(self._selected)
+        return None
+
+    def _fill(self):
+        while len(self._chosen) < self.count and self._candidates:
+            price, i = heappop(self._candidates)
+            if i >= self.first:
+                self._chosen.add(i)
+                heappush(self._selected, (-price, -i))
+
+    def resize(self, count):
+        self.count = count
+        while len(self._chosen) > count:
+            price, i = self._pop_selected()
+            heappop(self._selected)
+            self._chosen.discard(i)
+            heappush(self._candidates, (price, i))
+        self._fill()
+
+    def advance(self, first):
+        """Drop the slots before first, which must not move backwards."""
+        for i in range(self.first, first):
+            self._chosen.discard(i)
+        self.first = max(self.first, first)
+        self._fill()
+
+    def selected(self):
+        """Selected slot indexes, lowest price first."""
+        return sorted(self._chosen, key=lambda i: (self._prices[i], i))
+
+    def includes(self, price):
+        """Whether a slot with this price would rank among the selection, losing ties."""
+        if len(self._chosen) < self.count:
+            return self.count > 0
+        top = self._pop_selected()
+        return top is not None and price < top[0]
+
+
+class DaySummary:
+    """Per delivery day statistics, computed once when the snapshot is built."""
+
+    __slots__ = ("series", "version", "average", "lowest", "highest", "lowest_average",
+                 "highest_average", "lowest_starts", "highest_starts", "sorted_prices", "_attributes",
+                 "_windows")
+
+    def __init__(self, series, lowest_count, highest_count):
+        prices = series.prices
+        self.series = series
+        # Equal for two summaries of the same prices and counts
+        self.version = hash((series.version, lowest_count, highest_count))
+        self.average = average(prices)
+        order = range(len(prices))
+        self.lowest = sorted(order, key=prices.__getitem__)[:lowest_count]
+        self.highest = sorted(order, key=prices.__getitem__, reverse=True)[:highest_count]
+        self.lowest_average = average([prices[i] for i in self.lowest])
+        self.highest_average = average([prices[i] for i in self.highest])
+        self.lowest_starts = frozenset(series.start_at(i) for i in self.lowest)
+        self.highest_starts = frozenset(series.start_at(i) for i in self.highest)
+        self.sorted_prices = array("d", sorted(prices))
+        self._attributes = {}
+        self._windows = {}
+        for duration in WINDOW_DURATIONS:
+            self.window(duration)
+            self.window(duration, highest=True)
+
+    def window(self, duration, highest=False):
+        """(start, end, average) of the cheapest or most expensive contiguous window of the day."""
+        key = (duration, highest)
+        if key not in self._windows:
+            series = self.series
+            starts = series.starts
+            ends = series.ends
+            window = best_window(starts, ends, series.prices, 0, len(series), duration, highest)
+            self._windows[key] = None if window is None else (starts[window[0]], ends[window[1] - 1], window[2])
+        return self._windows[key]
+
+    def attributes(self, kind, full=False):
+        """Attribute payload summarizing the "points", "lowest" or "highest" slots.
+
+        With full the rendered slots are listed under "data" as well. Built on
+        first use and shared by every later read of this summary.
+        """
+        attributes = self._attributes.get((kind, full))
+        if attributes is None:
+            series = self.series
+            indices = range(len(series)) if kind == "points" else getattr(self, kind)
+            attributes = summarize_points([series.start_at(i) for i in indices], [series.prices[i] for i in indices])
+            if full:
+                attributes["data"] = series.render(indices)
+            self._attributes[(kind, full)] = attributes
+        return attributes
+
+
+class PriceSnapshot:
+    """Immutable view of one coordinator refresh.
+
+    Everything that only depends on the fetched data is computed up front. The
+    values that depend on the current time (current slot, future selections) are
+    answered from precomputed indexes and memoized per slot.
+    """
+
+    def __init__(self, data, lowest_count, highest_count, history=None):
+        self.lowest_count = lowest_count
+        self.highest_count = highest_count
+        # Sorted all-in prices of the archived days before today
+        self.history = history if history is not None else array("d")
+        self.days = {
+            date_str: DaySummary(series, lowest_count, highest_count)
+            for date_str, series in data.items()
+        }
+        self._starts = array("q")
+        self._ends = array("q")
+        self._prices = array("d")
+        self._net_prices = array("d")
+        self._sell_prices = array("d")
+        for series in sorted(data.values(), key=lambda series: series.start):
+            self._starts.extend(series.starts)
+            self._ends.extend(series.ends)
+            self._prices.extend(series.prices)
+            self._net_prices.extend(series.net_prices)
+            self._sell_prices.extend(series.prices if series.sell_prices is None else series.sell_prices)
+        self.average = average(self._prices)
+        self.version = hash(tuple(sorted((key, day.version) for key, day in self.days.items())))
+
+        self.index = SlotIndex(self._starts, self._ends)
+        # _suffix[i] is the sum of all prices from position i onwards
+        self._suffix = array("d", bytes(8 * (len(self._prices) + 1)))
+        for i in range(len(self._prices) - 1, -1, -1):
+            self._suffix[i] = self._suffix[i + 1] + self._prices[i]
+        self._attributes = {}
+        self._points = None
+        # Lowest future slots, advanced as time moves on instead of re-sorted per slot
+        self._lowest_tracker = None
+        self._resampled = {}
+        # Sorted prices of the slots from _sorted_first onwards, expired slots are deleted by bisection
+        self._future_sorted = None
+        self._sorted_first = None
+        # Values that depend on the first future slot, dropped when it moves on
+        self._slot_first = None
+        self._slot_cache = {}
+
+    def render(self, indices):
+        return [
+            render_point(self._starts[i], self._ends[i], self._prices[i], self._net_prices[i])
+            for i in indices
+        ]
+
+    def _attributes_for(self, indices, full):
+        attributes = summarize_points([self._starts[i] for i in indices], [self._prices[i] for i in indices])
+        if full:
+            attributes["data"] = self.render(indices)
+        return attributes
+
+    @property
+    def prices(self):
+        """All-in prices of every slot, in index order."""
+        return self._prices
+
+    @property
+    def sell_prices(self):
+        """Feed-in prices of every slot, in index order."""
+        return self._sell_prices
+
+    @property
+    def points(self):
+        if self._points is None:
+            self._points = self.render(range(len(self._prices)))
+        return self._points
+
+    def attributes(self, full=False):
+        """Summary of every slot, with full also the rendered slots under "data"."""
+        if full not in self._attributes:
+            self._attributes[full] = self._attributes_for(range(len(self._prices)), full)
+        return self._attributes[full]
+
+    def _slot_cached(self, key, first, build):
+        if first != self._slot_first:
+            self._slot_first = first
+            self._slot_cache = {}
+        if key not in self._slot_cache:
+            self._slot_cache[key] = build()
+        return self._slot_cache[key]
+
+    def day(self, date_str):
+        return self.days.get(date_str)
+
+    def current_start(self, now=None):
+        i = self.index.slot_at(now)
+        return None if i is None else self._starts[i]
+
+    def current_price(self, now=None):
+        i = self.index.slot_at(now)
+        return None if i is None else self._prices[i]
+
+    def current_sell_price(self, now=None):
+        i = self.index.slot_at(now)
+        return None if i is None else self._sell_prices[i]
+
+    def price_at(self, when):
+        i = self.index.slot_at(when)
+        return None if i is None else self._prices[i]
+
+    def resampled(self, resolution, how="mean"):
+        """Snapshot of every delivery day aggregated to resolution seconds, buckets start at local midnight.
+
+        The lowest/highest counts are quarter hours, they are scaled to the
+        same span of time in buckets. Built once per resolution and aggregate,
+        the snapshot never changes.
+        """
+        key = (resolution, how)
+        snapshot = self._resampled.get(key)
+        if snapshot is None:
+            scale = SLOT_SECONDS / max(resolution, SLOT_SECONDS)
+            snapshot = self._resampled[key] = PriceSnapshot(
+                {date_str: day.series.resample(resolution, how) for date_str, day in self.days.items()},
+                max(1, round(self.lowest_count * scale)), max(1, round(self.highest_count * scale)),
+                self.history
+            )
+        return snapshot
+
+    def range_points(self, start=None, end=None, resolution=None, how="mean"):
+        """Render the slots overlapping [start, end), optionally aggregated to a coarser resolution.
+
+        start and end are epoch seconds, resolution is in seconds.
+        """
+        if resolution:
+            return self.resampled(resolution, how).range_points(start, end)
+        lo = 0 if start is None else bisect_right(self._ends, start)
+        hi = len(self._starts) if end is None else bisect_left(self._starts, end)
+        return self.render(range(lo, hi))
+
+    def next_points(self, count, now=None):
+        return self.render(self.index.next_slots(count, now))
+
+    def future_attributes(self, now=None, full=False):
+        first = self.index.first_after(now)
+        return self._slot_cached(
+            ("future", full), first, lambda: self._attributes_for(range(first, len(self._prices)), full)
+        )
+
+    def future_points(self, now=None):
+        return self.points[self.index.first_after(now):]
+
+    def future_average(self, now=None):
+        first = self.index.first_after(now)
+        count = len(self._prices) - first
+        if not count:
+            return None
+        return round(self._suffix[first] / count, 5)
+
+    def _lowest_future(self, now):
+        first = self.index.first_after(now)
+
+        def build():
+            tracker = self._lowest_tracker
+            if tracker is None or first < tracker.first:
+                tracker = self._lowest_tracker = LowestTracker(self._prices, self.lowest_count, first)
+            else:
+                tracker.resize(self.lowest_count)
+                tracker.advance(first)
+            return tracker.selected()
+
+        return first, self._slot_cached("lowest", first, build)
+
+    def lowest_future_attributes(self, now=None, full=False):
+        first, selected = self._lowest_future(now)
+        return self._slot_cached(("lowest_attributes", full), first, lambda: self._attributes_for(selected, full))
+
+    def lowest_future(self, now=None):
+        first, selected = self._lowest_future(now)
+        return self._slot_cached("lowest_points", first, lambda: self.render(selected))
+
+    def lowest_future_average(self, now=None):
+        first, selected = self._lowest_future(now)
+        return self._slot_cached(
+            "lowest_average", first, lambda: average([self._prices[i] for i in selected])
+        )
+
+    def future_window(self, duration, highest=False, now=None):
+        """(start, end, average) of the best contiguous window among the future slots."""
+        first = self.index.first_after(now)
+
+        def build():
+            window = best_window(self._starts, self._ends, self._prices, first, len(self._prices),
+                                 duration, highest)
+            return None if window is None else (self._starts[window[0]], self._ends[window[1] - 1], window[2])
+
+        return self._slot_cached(("window", duration, highest), first, build)
+
+    def window(self, scope, duration, highest=False, now=None):
+        """Best window for "future" or a YYYYMMDD delivery day."""
+        if scope == "future":
+            return self.future_window(duration, highest, now)
+        day = self.days.get(scope)
+        return None if day is None else day.window(duration, highest)
+
+    def _future_sorted_prices(self, first):
+        if self._future_sorted is None or first < self._sorted_first:
+            self._future_sorted = array("d", sorted(self._prices[first:]))
+        else:
+            for i in range(self._sorted_first, first):
+                del self._future_sorted[bisect_left(self._future_sorted, self._prices[i])]
+        self._sorted_first = first
+        return self._future_sorted
+
+    def rank(self, scope, now=None):
+        """(rank, percentile) of the current price among "today", "future" or "history" prices."""
+        now = _timestamp(now)
+        current = self.index.slot_at(now)
+        if current is None:
+            return None
+        price = self._prices[current]
+        if scope == "future":
+            first = self.index.first_after(now)
+            return self._slot_cached(
+                ("rank", current), first, lambda: rank(self._future_sorted_prices(first), price)
+            )
+        if scope == "history":
+            return rank(self.history, price)
+        tz = dt_util.get_default_time_zone()
+        day = self.days.get(datetime.fromtimestamp(self._starts[current], tz).strftime("%Y%m%d"))
+        return None if day is None else rank(day.sorted_prices, price)
+
+    def in_lowest_future(self, now=None):
+        """Whether the current slot ranks among the lowest of the remaining slots."""
+        now = _timestamp(now)
+        current = self.index.slot_at(now)
+        if current is None:
+            return False
+        first, _ = self._lowest_future(now)
+        return self._slot_cached(
+            ("in_lowest", current), first, lambda: self._lowest_tracker.includes(self._prices[current])
+        )
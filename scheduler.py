@@ -0,0 +1,162 @@
+from datetime import datetime
+
+from homeassistant.util import dt as dt_util
+
+# Branch and bound nodes searched before settling for the best plan found
+EXACT_NODE_LIMIT = 50000
+
+
+class Job:
+    """Flexible load that runs uninterrupted for duration seconds at power kW."""
+
+    __slots__ = ("name", "duration", "power", "earliest", "deadline", "candidates")
+
+    def __init__(self, name, duration, power, earliest=None, deadline=None):
+        self.name = name
+        self.duration = duration
+        self.power = power
+        self.earliest = earliest
+        self.deadline = deadline
+        # (cost, first slot, stop slot) of every feasible placement, cheapest first
+        self.candidates = []
+
+
+def _placements(starts, ends, prices, first, job):
+    """Every contiguous run of slots covering the job within its time limits, cheapest first."""
+    n = len(starts)
+    candidates = []
+    total = 0.0
+    right = first
+    for left in range(first, n):
+        if job.earliest is not None and starts[left] < job.earliest:
+            continue
+        if right <= left:
+            right = left
+            total = 0.0
+        while right < n and (right == left or starts[right] == ends[right - 1]) \
+                and (right == left or ends[right - 1] - starts[left] < job.duration):
+            total += prices[right] * (ends[right] - starts[right]) / 3600
+            right += 1
+        if right > left and ends[right - 1] - starts[left] >= job.duration:
+            if job.deadline is None or ends[right - 1] <= job.deadline:
+                candidates.append((round(total * job.power, 5), left, right))
+        if right > left:
+            total -= prices[left] * (ends[left] - starts[left]) / 3600
+    candidates.sort()
+    return candidates
+
+
+def _fits(load, job, left, right, max_power):
+    return max_power is None or all(load[i] + job.power <= max_power + 1e-9 for i in range(left, right))
+
+
+def _place(load, job, left, right, sign):
+    for i in range(left, right):
+        load[i] += sign * job.power
+
+
+def schedule_jobs(snapshot, jobs, max_power=None, now=None):
+    """Cheapest start for every job without the summed power exceeding max_power in any slot.
+
+    Jobs are placed greedily, biggest energy use first, each at its cheapest
+    placement that still fits. A branch and bound search over all placements
+    then improves on that plan; when it completes within EXACT_NODE_LIMIT
+    nodes the result is optimal.
+
+    The "status" of the result is "optimal", "not_proven_optimal" when the
+    search was cut off with every job placed, or "incomplete" when some jobs
+    are listed under "unscheduled". Their "reason" is "no_slots" without any
+    placement between their earliest start and deadline, or "max_power" when
+    none fits next to the other jobs.
+    """
+    starts = snapshot.index.starts
+    ends = snapshot.index.ends
+    prices = snapshot.prices
+    first = snapshot.index.first_after(now)
+    for job in jobs:
+        job.candidates = _placements(starts, ends, prices, first, job)
+    order = sorted(jobs, key=lambda job: (-job.power * job.duration, len(job.candidates)))
+
+    load = [0.0] * len(starts)
+    greedy = {}
+    for job in order:
+        for cost, left, right in job.candidates:
+            if _fits(load, job, left, right, max_power):
+                _place(load, job, left, right, 1)
+                greedy[job.name] = (cost, left, right)
+                break
+
+    best = {"cost": None, "plan": None}
+    if len(greedy) == len(jobs):
+        best["cost"] = sum(cost for cost, _, _ in greedy.values())
+        best["plan"] = greedy
+    # Least flexible jobs first keeps the search tree narrow
+    order = sorted(jobs, key=lambda job: len(job.candidates))
+    # bound[k] is the cost of jobs k.. at their cheapest placement, ignoring the power cap
+    bound = [0.0] * (len(order) + 1)
+    for k in range(len(order) - 1, -1, -1):
+        bound[k] = bound[k + 1] + (order[k].candidates[0][0] if order[k].candidates else 0.0)
+    load = [0.0] * len(starts)
+    plan = {}
+    nodes = 0
+    complete = all(job.candidates for job in jobs)
+
+    def search(k, cost):
+        nonlocal nodes, complete
+        if k == len(order):
+            if best["cost"] is None or cost < best["cost"] - 1e-9:
+                best["cost"] = cost
+                best["plan"] = dict(plan)
+            return
+        job = order[k]
+        for candidate in job.candidates:
+            if best["cost"] is not None and cost + candidate[0] + bound[k + 1] >= best["cost"] - 1e-9:
+                # Candidates are sorted by cost, the rest cannot do better either
+                return
+            nodes += 1
+            if nodes > EXACT_NODE_LIMIT:
+                complete = False
+                return
+            _, left, right = candidate
+            if not _fits(load, job, left, right, max_power):
+                continue
+            _place(load, job, left, right, 1)
+            plan[job.name] = candidate
+            search(k + 1, cost + candidate[0])
+            del plan[job.name]
+            _place(load, job, left, right, -1)
+            if nodes > EXACT_NODE_LIMIT:
+                return
+
+    if complete:
+        search(0, 0.0)
+    result = best["plan"] if best["plan"] is not None else greedy
+
+    tz = dt_util.get_default_time_zone()
+    scheduled = []
+    for job in jobs:
+        if job.name not in result:
+            continue
+        cost, left, right = result[job.name]
+        scheduled.append({
+            "name": job.name,
+            "start": datetime.fromtimestamp(starts[left], tz).isoformat(),
+            "end": datetime.fromtimestamp(ends[right - 1], tz).isoformat(),
+            "cost": cost,
+        })
+    unscheduled = [
+        {"name": job.name, "reason": "max_power" if job.candidates else "no_slots"}
+        for job in jobs if job.name not in result
+    ]
+    optimal = complete and best["plan"] is not None
+    if optimal:
+        status = "optimal"
+    else:
+        status = "not_proven_optimal" if best["plan"] is not None else "incomplete"
+    return {
+        "jobs": scheduled,
+        "unscheduled": unscheduled,
+        "total_cost": round(sum(job["cost"] for job in scheduled), 5),
+        "optimal": optimal,
+        "status": status,
+    }
@@ -1,14 +1,99 @@
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
+from .prices import HOUR_SECONDS, render_window
 
 import logging
-from datetime import datetime, timezone, timedelta
+from datetime import timedelta
 
 _LOGGER = logging.getLogger(__name__)
 
+# Attributes only summarize the prices, full lists are served by the get_prices
+# service and websocket command. The optional "data" lists are too large to
+# store with every state change.
+UNRECORDED_ATTRIBUTES = frozenset({"data"})
+
+def _today_str():
+    return dt_util.now().date().strftime("%Y%m%d")
+
+def _tomorrow_str():
+    return (dt_util.now().date() + timedelta(days=1)).strftime("%Y%m%d")
+
+def _day_after_tomorrow_str():
+    return (dt_util.now().date() + timedelta(days=2)).strftime("%Y%m%d")
+
+def _forecast_day(coordinator, date_str):
+    forecast = coordinator.forecast
+    return None if forecast is None else forecast.day(date_str)
+
+def _hourly_day(coordinator, date_str):
+    return coordinator.resample(HOUR_SECONDS).day(date_str)
+
+def _window_attributes(window, duration):
+    if window is None:
+        return {}
+    return {**render_window(*window), "duration": duration}
+
+def _rank_attributes(ranked):
+    if ranked is None:
+        return {}
+    return {"rank": ranked[0]}
+
+class Frank2Entity(CoordinatorEntity):
+    """Coordinator entity that only writes its state when it actually changed."""
+
+    _written = None
+
+    def _data_version(self):
+        """Identifies the attribute payload, None when the attributes never change."""
+        return None
+
+    @callback
+    def _handle_coordinator_update(self):
+        self._async_write_if_changed()
+
+    @callback
+    def _async_write_if_changed(self):
+        # Switching the price list attributes changes every payload without changing the data
+        fingerprint = (self.available, self.state, self._data_version(), self.coordinator.price_list_attributes)
+        if fingerprint == self._written:
+            self.coordinator.skipped_state_writes += 1
+            return
+        self._written = fingerprint
+        self.coordinator.state_writes += 1
+        self.async_write_ha_state()
+
+class Frank2SlotEntity(Frank2Entity):
+    """Entity whose state changes when a price slot starts, updated from cached data."""
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_tick_listener(self._handle_slot_tick))
+
+    @callback
+    def _handle_slot_tick(self):
+        self._async_write_if_changed()
+
+class Frank2DayEntity(Frank2SlotEntity):
+    """Entity whose state only changes when the local date rolls over."""
+
+    _day = None
+
+    async def async_added_to_hass(self):
+        self._day = _today_str()
+        await super().async_added_to_hass()
+
+    @callback
+    def _handle_slot_tick(self):
+        day = _today_str()
+        if day != self._day:
+            self._day = day
+            self._async_write_if_changed()
+
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = entry.runtime_data
     async_add_entities([
@@ -25,10 +110,37 @@ async def async_setup_entry(hass, entry, async_add_entities):
         Frank2LowestPeriodsTodaySensor(coordinator, entry),
         Frank2InHighestPeriod(coordinator, entry),
         Frank2InLowestPeriod(coordinator, entry),
-        Frank2InLowestPeriodsFuture(coordinator, entry)
+        Frank2InLowestPeriodsFuture(coordinator, entry),
+        Frank2CheapestWindowTodaySensor(coordinator, entry),
+        Frank2CheapestWindowTomorrowSensor(coordinator, entry),
+        Frank2CheapestWindowFutureSensor(coordinator, entry),
+        Frank2MostExpensiveWindowFutureSensor(coordinator, entry),
+        Frank2InCheapestWindowToday(coordinator, entry),
+        Frank2BatteryScheduleSensor(coordinator, entry),
+        Frank2PercentileTodaySensor(coordinator, entry),
+        Frank2PercentileFutureSensor(coordinator, entry),
+        Frank2PercentileHistorySensor(coordinator, entry),
+        Frank2BelowPercentileToday(coordinator, entry),
+        Frank2BelowPercentileFuture(coordinator, entry),
+        Frank2BelowPercentileHistory(coordinator, entry),
+        Frank2ForecastSensor(coordinator, entry),
+        Frank2AverageElectricityTodayHourlySensor(coordinator, entry),
+        Frank2AverageElectricityTomorrowHourlySensor(coordinator, entry),
+        Frank2LowestPeriodsTodayHourlySensor(coordinator, entry),
+        Frank2LowestPeriodsTomorrowHourlySensor(coordinator, entry),
+        Frank2HighestPeriodsTodayHourlySensor(coordinator, entry),
+        Frank2HighestPeriodsTomorrowHourlySensor(coordinator, entry),
+        Frank2AverageElectricityTomorrowForecastSensor(coordinator, entry),
+        Frank2AverageElectricityDayAfterTomorrowForecastSensor(coordinator, entry),
+        Frank2LowestPeriodsTomorrowForecastSensor(coordinator, entry),
+        Frank2LowestPeriodsDayAfterTomorrowForecastSensor(coordinator, entry),
+        Frank2HighestPeriodsTomorrowForecastSensor(coordinator, entry),
+        Frank2HighestPeriodsDayAfterTomorrowForecastSensor(coordinator, entry)
     ])
 
-class Frank2AllInSensor(CoordinatorEntity, SensorEntity):
+class Frank2AllInSensor(Frank2Entity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
     def __init__(self, coordinator, entry):
         super().__init__(coordinator)
         self._entry = entry
@@ -43,19 +155,16 @@ class Frank2AllInSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def state(self):
-        data = self.coordinator.data
-        if not data:
+        snapshot = self.coordinator.snapshot
+        if not snapshot.days:
             _LOGGER.warning("No data available from coordinator")
             return None
-        all_prices = []
-        for date, points in data.items():
-            all_prices.extend([p["price"] for p in points])
-        if not all_prices:
+        if snapshot.average is None:
             _LOGGER.warning("No prices found in data")
-            return None
-        avg = round(sum(all_prices) / len(all_prices), 5)
-        _LOGGER.debug(f"All In Average price: {avg}")
-        return avg
+        return snapshot.average
+
+    def _data_version(self):
+        return self.coordinator.snapshot.version
 
     @property
     def unit_of_measurement(self):
@@ -63,15 +172,12 @@ class Frank2AllInSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self):
-        data = self.coordinator.data
-        if not data:
+        snapshot = self.coordinator.snapshot
+        if not snapshot.days:
             return {}
-        all_points = []
-        for date, points in data.items():
-            all_points.extend(points)
-        return {"data": all_points}
+        return snapshot.attributes(self.coordinator.price_list_attributes)
 
-class Frank2CurrentAllInSensor(CoordinatorEntity, SensorEntity):
+class Frank2CurrentAllInSensor(Frank2SlotEntity, SensorEntity):
     def __init__(self, coordinator, entry):
         super().__init__(coordinator)
         self._entry = entry
@@ -86,19 +192,17 @@ class Frank2CurrentAllInSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def state(self):
-        data = self.coordinator.data
-        if not data:
+        snapshot = self.coordinator.snapshot
+        if not snapshot.days:
             _LOGGER.warning("No data available from coordinator")
             return None
-        current_time = datetime.now(timezone.utc)
-        for date, points in data.items():
-            for point in points:
-                start = datetime.fromisoformat(point["start"])
-                end = datetime.fromisoformat(point["end"])
-                if start <= current_time < end:
-                    return point["price"]
-        _LOGGER.warning("No current price found")
-        return None
+        price = snapshot.current_price()
+        if price is None:
+            _LOGGER.warning("No current price found")
+        return price
+
+    def _data_version(self):
+        return self.coordinator.snapshot.current_sell_price()
 
     @property
     def unit_of_measurement(self):
@@ -106,9 +210,14 @@ class Frank2CurrentAllInSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self):
-        return {}
+        sell_price = self.coordinator.snapshot.current_sell_price()
+        if sell_price is None:
+            return {}
+        return {"feed_in_price": sell_price}
+
+class Frank2FutureAveragePriceSensor(Frank2SlotEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
 
-class Frank2FutureAveragePriceSensor(CoordinatorEntity, SensorEntity):
     def __init__(self, coordinator, entry):
         super().__init__(coordinator)
         self._entry = entry
@@ -123,43 +232,33 @@ class Frank2FutureAveragePriceSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def state(self):
-        data = self.coordinator.data
-        if not data:
+        snapshot = self.coordinator.snapshot
+        if not snapshot.days:
             _LOGGER.warning("No data available from coordinator")
             return None
-        current_time = datetime.now(timezone.utc)
-        future_prices = []
-        for date, points in data.items():
-            for point in points:
-                start = datetime.fromisoformat(point["start"])
-                if start > current_time:
-                    future_prices.append(point["price"])
-        if not future_prices:
+        avg = snapshot.future_average()
+        if avg is None:
             _LOGGER.warning("No future prices found")
-            return None
-        avg = round(sum(future_prices) / len(future_prices), 5)
-        _LOGGER.debug(f"Future Average price: {avg}")
         return avg
 
+    def _data_version(self):
+        snapshot = self.coordinator.snapshot
+        return snapshot.version, snapshot.index.first_after()
+
     @property
     def unit_of_measurement(self):
         return "EUR/kWh"
 
     @property
     def extra_state_attributes(self):
-        data = self.coordinator.data
-        if not data:
+        snapshot = self.coordinator.snapshot
+        if not snapshot.days:
             return {}
-        current_time = datetime.now(timezone.utc)
-        future_points = []
-        for date, points in data.items():
-            for point in points:
-                start = datetime.fromisoformat(point["start"])
-                if start > current_time:
-                    future_points.append(point)
-        return {"data": future_points}
+        return snapshot.future_attributes(full=self.coordinator.price_list_attributes)
+
+class Frank2AverageElectricityTodaySensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
 
-class Frank2AverageElectricityTodaySensor(CoordinatorEntity, SensorEntity):
     def __init__(self, coordinator, entry):
         super().__init__(coordinator)
         self._entry = entry
@@ -174,17 +273,14 @@ class Frank2AverageElectricityTodaySensor(CoordinatorEntity, SensorEntity):
 
     @property
     def state(self):
-        data = self.coordinator.data
-        if not data:
-            return None
-        today_str = datetime.utcnow().date().strftime("%Y%m%d")
-        if today_str not in data:
+        day = self.coordinator.snapshot.day(_today_str())
+        if day is None:
             return None
-        points = data[today_str]
-        if not points:
-            return None
-        avg = sum(p["price"] for p in points) / len(points)
-        return round(avg, 5)
+        return day.average
+
+    def _data_version(self):
+        day = self.coordinator.snapshot.day(_today_str())
+        return None if day is None else day.version
 
     @property
     def unit_of_measurement(self):
@@ -192,15 +288,14 @@ class Frank2AverageElectricityTodaySensor(CoordinatorEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self):
-        data = self.coordinator.data
-        if not data:
+        day = self.coordinator.snapshot.day(_today_str())
+        if day is None:
             return {}
-        today_str = datetime.utcnow().date().strftime("%Y%m%d")
-        if today_str not in data:
-            return {}
-        return {"data": data[today_str]}
+        return day.attributes("points", self.coordinator.price_list_attributes)
+
+class Frank2AverageElectricityTomorrowSensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
 
-class Frank2AverageElectricityTomorrowSensor(CoordinatorEntity, SensorEntity):
     def __init__(self, coordinator, entry):
         super().__init__(coordinator)
         self._entry = entry
@@ -215,17 +310,14 @@ class Frank2AverageElectricityTomorrowSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def state(self):
-        data = self.coordinator.data
-        if not data:
+        day = self.coordinator.snapshot.day(_tomorrow_str())
+        if day is None:
             return None
-        tomorrow_str = (datetime.utcnow().date() + timedelta(days=1)).strftime("%Y%m%d")
-        if tomorrow_str not in data:
-            return None
-        points = data[tomorrow_str]
-        if not points:
-            return None
-        avg = sum(p["price"] for p in points) / len(points)
-        return round(avg, 5)
+        return day.average
+
+    def _data_version(self):
+        day = self.coordinator.snapshot.day(_tomorrow_str())
+        return None if day is None else day.version
 
     @property
     def unit_of_measurement(self):
@@ -233,15 +325,14 @@ class Frank2AverageElectricityTomorrowSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self):
-        data = self.coordinator.data
-        if not data:
-            return {}
-        tomorrow_str = (datetime.utcnow().date() + timedelta(days=1)).strftime("%Y%m%d")
-        if tomorrow_str not in data:
+        day = self.coordinator.snapshot.day(_tomorrow_str())
+        if day is None:
             return {}
-        return {"data": data[tomorrow_str]}
+        return day.attributes("points", self.coordinator.price_list_attributes)
+
+class Frank2LowestPeriodsFutureSensor(Frank2SlotEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
 
-class Frank2LowestPeriodsFutureSensor(CoordinatorEntity, SensorEntity):
     def __init__(self, coordinator, entry):
         super().__init__(coordinator)
         self._entry = entry
@@ -256,25 +347,14 @@ class Frank2LowestPeriodsFutureSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def state(self):
-        data = self.coordinator.data
-        if not data:
-            return None
-        current_time = datetime.now(timezone.utc)
-        future_points = []
-        for date, points in data.items():
-            for point in points:
-                start = datetime.fromisoformat(point["start"])
-                if start > current_time:
-                    future_points.append(point)
-        if not future_points:
+        snapshot = self.coordinator.snapshot
+        if not snapshot.days:
             return None
-        sorted_points = sorted(future_points, key=lambda p: p["price"])
-        count = self._entry.data.get("lowest_periods_count", 14)
-        selected = sorted_points[:count]
-        if not selected:
-            return None
-        avg = sum(p["price"] for p in selected) / len(selected)
-        return round(avg, 5)
+        return snapshot.lowest_future_average()
+
+    def _data_version(self):
+        snapshot = self.coordinator.snapshot
+        return snapshot.version, snapshot.index.first_after()
 
     @property
     def unit_of_measurement(self):
@@ -282,22 +362,14 @@ class Frank2LowestPeriodsFutureSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self):
-        data = self.coordinator.data
-        if not data:
+        snapshot = self.coordinator.snapshot
+        if not snapshot.days:
             return {}
-        current_time = datetime.now(timezone.utc)
-        future_points = []
-        for date, points in data.items():
-            for point in points:
-                start = datetime.fromisoformat(point["start"])
-                if start > current_time:
-                    future_points.append(point)
-        sorted_points = sorted(future_points, key=lambda p: p["price"])
-        count = self._entry.data.get("lowest_periods_count", 14)
-        selected = sorted_points[:count]
-        return {"data": selected}
+        return snapshot.lowest_future_attributes(full=self.coordinator.price_list_attributes)
+
+class Frank2HighestPeriodsTodaySensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
 
-class Frank2HighestPeriodsTodaySensor(CoordinatorEntity, SensorEntity):
     def __init__(self, coordinator, entry):
         super().__init__(coordinator)
         self._entry = entry
@@ -312,20 +384,14 @@ class Frank2HighestPeriodsTodaySensor(CoordinatorEntity, SensorEntity):
 
     @property
     def state(self):
-        data = self.coordinator.data
-        if not data:
-            return None
-        today_str = datetime.utcnow().date().strftime("%Y%m%d")
-        if today_str not in data:
+        day = self.coordinator.snapshot.day(_today_str())
+        if day is None:
             return None
-        points = data[today_str]
-        sorted_points = sorted(points, key=lambda p: p["price"], reverse=True)
-        count = self._entry.data.get("highest_periods_count", 8)
-        selected = sorted_points[:count]
-        if not selected:
-            return None
-        avg = sum(p["price"] for p in selected) / len(selected)
-        return round(avg, 5)
+        return day.highest_average
+
+    def _data_version(self):
+        day = self.coordinator.snapshot.day(_today_str())
+        return None if day is None else day.version
 
     @property
     def unit_of_measurement(self):
@@ -333,19 +399,14 @@ class Frank2HighestPeriodsTodaySensor(CoordinatorEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self):
-        data = self.coordinator.data
-        if not data:
+        day = self.coordinator.snapshot.day(_today_str())
+        if day is None:
             return {}
-        today_str = datetime.utcnow().date().strftime("%Y%m%d")
-        if today_str not in data:
-            return {}
-        points = data[today_str]
-        sorted_points = sorted(points, key=lambda p: p["price"], reverse=True)
-        count = self._entry.data.get("highest_periods_count", 8)
-        selected = sorted_points[:count]
-        return {"data": selected}
+        return day.attributes("highest", self.coordinator.price_list_attributes)
+
+class Frank2LowestPeriodsTomorrowSensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
 
-class Frank2LowestPeriodsTomorrowSensor(CoordinatorEntity, SensorEntity):
     def __init__(self, coordinator, entry):
         super().__init__(coordinator)
         self._entry = entry
@@ -360,20 +421,14 @@ class Frank2LowestPeriodsTomorrowSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def state(self):
-        data = self.coordinator.data
-        if not data:
-            return None
-        tomorrow_str = (datetime.utcnow().date() + timedelta(days=1)).strftime("%Y%m%d")
-        if tomorrow_str not in data:
-            return None
-        points = data[tomorrow_str]
-        sorted_points = sorted(points, key=lambda p: p["price"])
-        count = self._entry.data.get("lowest_periods_count", 14)
-        selected = sorted_points[:count]
-        if not selected:
+        day = self.coordinator.snapshot.day(_tomorrow_str())
+        if day is None:
             return None
-        avg = sum(p["price"] for p in selected) / len(selected)
-        return round(avg, 5)
+        return day.lowest_average
+
+    def _data_version(self):
+        day = self.coordinator.snapshot.day(_tomorrow_str())
+        return None if day is None else day.version
 
     @property
     def unit_of_measurement(self):
@@ -381,19 +436,14 @@ class Frank2LowestPeriodsTomorrowSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self):
-        data = self.coordinator.data
-        if not data:
-            return {}
-        tomorrow_str = (datetime.utcnow().date() + timedelta(days=1)).strftime("%Y%m%d")
-        if tomorrow_str not in data:
+        day = self.coordinator.snapshot.day(_tomorrow_str())
+        if day is None:
             return {}
-        points = data[tomorrow_str]
-        sorted_points = sorted(points, key=lambda p: p["price"])
-        count = self._entry.data.get("lowest_periods_count", 14)
-        selected = sorted_points[:count]
-        return {"data": selected}
+        return day.attributes("lowest", self.coordinator.price_list_attributes)
+
+class Frank2LowestPeriodsTodaySensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
 
-class Frank2LowestPeriodsTodaySensor(CoordinatorEntity, SensorEntity):
     def __init__(self, coordinator, entry):
         super().__init__(coordinator)
         self._entry = entry
@@ -408,20 +458,14 @@ class Frank2LowestPeriodsTodaySensor(CoordinatorEntity, SensorEntity):
 
     @property
     def state(self):
-        data = self.coordinator.data
-        if not data:
-            return None
-        today_str = datetime.utcnow().date().strftime("%Y%m%d")
-        if today_str not in data:
+        day = self.coordinator.snapshot.day(_today_str())
+        if day is None:
             return None
-        points = data[today_str]
-        sorted_points = sorted(points, key=lambda p: p["price"])
-        count = self._entry.data.get("lowest_periods_count", 14)
-        selected = sorted_points[:count]
-        if not selected:
-            return None
-        avg = sum(p["price"] for p in selected) / len(selected)
-        return round(avg, 5)
+        return day.lowest_average
+
+    def _data_version(self):
+        day = self.coordinator.snapshot.day(_today_str())
+        return None if day is None else day.version
 
     @property
     def unit_of_measurement(self):
@@ -429,19 +473,14 @@ class Frank2LowestPeriodsTodaySensor(CoordinatorEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self):
-        data = self.coordinator.data
-        if not data:
+        day = self.coordinator.snapshot.day(_today_str())
+        if day is None:
             return {}
-        today_str = datetime.utcnow().date().strftime("%Y%m%d")
-        if today_str not in data:
-            return {}
-        points = data[today_str]
-        sorted_points = sorted(points, key=lambda p: p["price"])
-        count = self._entry.data.get("lowest_periods_count", 14)
-        selected = sorted_points[:count]
-        return {"data": selected}
+        return day.attributes("lowest", self.coordinator.price_list_attributes)
+
+class Frank2HighestPeriodsTomorrowSensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
 
-class Frank2HighestPeriodsTomorrowSensor(CoordinatorEntity, SensorEntity):
     def __init__(self, coordinator, entry):
         super().__init__(coordinator)
         self._entry = entry
@@ -456,20 +495,14 @@ class Frank2HighestPeriodsTomorrowSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def state(self):
-        data = self.coordinator.data
-        if not data:
+        day = self.coordinator.snapshot.day(_tomorrow_str())
+        if day is None:
             return None
-        tomorrow_str = (datetime.utcnow().date() + timedelta(days=1)).strftime("%Y%m%d")
-        if tomorrow_str not in data:
-            return None
-        points = data[tomorrow_str]
-        sorted_points = sorted(points, key=lambda p: p["price"], reverse=True)
-        count = self._entry.data.get("highest_periods_count", 8)
-        selected = sorted_points[:count]
-        if not selected:
-            return None
-        avg = sum(p["price"] for p in selected) / len(selected)
-        return round(avg, 5)
+        return day.highest_average
+
+    def _data_version(self):
+        day = self.coordinator.snapshot.day(_tomorrow_str())
+        return None if day is None else day.version
 
     @property
     def unit_of_measurement(self):
@@ -477,19 +510,12 @@ class Frank2HighestPeriodsTomorrowSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self):
-        data = self.coordinator.data
-        if not data:
-            return {}
-        tomorrow_str = (datetime.utcnow().date() + timedelta(days=1)).strftime("%Y%m%d")
-        if tomorrow_str not in data:
+        day = self.coordinator.snapshot.day(_tomorrow_str())
+        if day is None:
             return {}
-        points = data[tomorrow_str]
-        sorted_points = sorted(points, key=lambda p: p["price"], reverse=True)
-        count = self._entry.data.get("highest_periods_count", 8)
-        selected = sorted_points[:count]
-        return {"data": selected}
+        return day.attributes("highest", self.coordinator.price_list_attributes)
 
-class Frank2InHighestPeriod(BinarySensorEntity, CoordinatorEntity):
+class Frank2InHighestPeriod(BinarySensorEntity, Frank2SlotEntity):
     def __init__(self, coordinator, entry):
         super().__init__(coordinator)
         self._entry = entry
@@ -504,25 +530,13 @@ class Frank2InHighestPeriod(BinarySensorEntity, CoordinatorEntity):
 
     @property
     def is_on(self):
-        data = self.coordinator.data
-        if not data:
+        snapshot = self.coordinator.snapshot
+        day = snapshot.day(_today_str())
+        if day is None:
             return False
-        today_str = datetime.utcnow().date().strftime("%Y%m%d")
-        if today_str not in data:
-            return False
-        points = data[today_str]
-        sorted_points = sorted(points, key=lambda p: p["price"], reverse=True)
-        count = self._entry.data.get("highest_periods_count", 8)
-        selected = sorted_points[:count]
-        current_time = datetime.now(timezone.utc)
-        for point in selected:
-            start = datetime.fromisoformat(point["start"])
-            end = datetime.fromisoformat(point["end"])
-            if start <= current_time < end:
-                return True
-        return False
+        return snapshot.current_start() in day.highest_starts
 
-class Frank2InLowestPeriod(BinarySensorEntity, CoordinatorEntity):
+class Frank2InLowestPeriod(BinarySensorEntity, Frank2SlotEntity):
     def __init__(self, coordinator, entry):
         super().__init__(coordinator)
         self._entry = entry
@@ -537,25 +551,13 @@ class Frank2InLowestPeriod(BinarySensorEntity, CoordinatorEntity):
 
     @property
     def is_on(self):
-        data = self.coordinator.data
-        if not data:
-            return False
-        today_str = datetime.utcnow().date().strftime("%Y%m%d")
-        if today_str not in data:
+        snapshot = self.coordinator.snapshot
+        day = snapshot.day(_today_str())
+        if day is None:
             return False
-        points = data[today_str]
-        sorted_points = sorted(points, key=lambda p: p["price"])
-        count = self._entry.data.get("lowest_periods_count", 14)
-        selected = sorted_points[:count]
-        current_time = datetime.now(timezone.utc)
-        for point in selected:
-            start = datetime.fromisoformat(point["start"])
-            end = datetime.fromisoformat(point["end"])
-            if start <= current_time < end:
-                return True
-        return False
+        return snapshot.current_start() in day.lowest_starts
 
-class Frank2InLowestPeriodsFuture(BinarySensorEntity, CoordinatorEntity):
+class Frank2InLowestPeriodsFuture(BinarySensorEntity, Frank2SlotEntity):
     def __init__(self, coordinator, entry):
         super().__init__(coordinator)
         self._entry = entry
@@ -570,35 +572,9 @@ class Frank2InLowestPeriodsFuture(BinarySensorEntity, CoordinatorEntity):
 
     @property
     def is_on(self):
-        data = self.coordinator.data
-        if not data:
-            return False
-        current_time = datetime.now(timezone.utc)
-        future_points = []
-        current_period = None
-        for date, points in data.items():
-            for point in points:
-                start = datetime.fromisoformat(point["start"])
-                end = datetime.fromisoformat(point["end"])
-                if start <= current_time < end:
-                    current_period = point
-                elif start > current_time:
-                    future_points.append(point)
-        if current_period:
-            future_points.append(current_period)
-        if not future_points:
-            return False
-        sorted_points = sorted(future_points, key=lambda p: p["price"])
-        count = self._entry.data.get("lowest_periods_count", 14)
-        selected = sorted_points[:count]
-        for point in selected:
-            start = datetime.fromisoformat(point["start"])
-            end = datetime.fromisoformat(point["end"])
-            if start <= current_time < end:
-                return True
-        return False
+        return self.coordinator.snapshot.in_lowest_future()
 
-class Frank2PriceDiffFutureSensor(CoordinatorEntity, SensorEntity):
+class Frank2PriceDiffFutureSensor(Frank2DayEntity, SensorEntity):
     def __init__(self, coordinator, entry):
         super().__init__(coordinator)
         self._entry = entry
@@ -613,35 +589,142 @@ class Frank2PriceDiffFutureSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def state(self):
-        data = self.coordinator.data
-        if not data:
+        snapshot = self.coordinator.snapshot
+        today = snapshot.day(_today_str())
+        tomorrow = snapshot.day(_tomorrow_str())
+        if today is None or tomorrow is None:
             return None
-        # Highest periods today
-        today_str = datetime.utcnow().date().strftime("%Y%m%d")
-        if today_str not in data:
+        if today.highest_average is None or tomorrow.lowest_average is None:
             return None
-        points_today = data[today_str]
-        sorted_today = sorted(points_today, key=lambda p: p["price"], reverse=True)
-        count_high = self._entry.data.get("highest_periods_count", 8)
-        selected_high = sorted_today[:count_high]
-        if not selected_high:
-            return None
-        avg_high = sum(p["price"] for p in selected_high) / len(selected_high)
+        return round(today.highest_average - tomorrow.lowest_average, 5)
 
-        # Lowest periods tomorrow
-        tomorrow_str = (datetime.utcnow().date() + timedelta(days=1)).strftime("%Y%m%d")
-        if tomorrow_str not in data:
-            return None
-        points_tomorrow = data[tomorrow_str]
-        sorted_tomorrow = sorted(points_tomorrow, key=lambda p: p["price"])
-        count_low = self._entry.data.get("lowest_periods_count", 14)
-        selected_low = sorted_tomorrow[:count_low]
-        if not selected_low:
-            return None
-        avg_low = sum(p["price"] for p in selected_low) / len(selected_low)
+    @property
+    def unit_of_measurement(self):
+        return "EUR/kWh"
+
+    @property
+    def extra_state_attributes(self):
+        return {}
+
+class Frank2CheapestWindowTodaySensor(Frank2DayEntity, SensorEntity):
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Cheapest Window Today"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_cheapest_window_today"
+
+    def _window(self):
+        return self.coordinator.snapshot.window(_today_str(), self.coordinator.window_duration * 60)
+
+    @property
+    def state(self):
+        window = self._window()
+        return None if window is None else window[2]
+
+    def _data_version(self):
+        return self._window()
+
+    @property
+    def unit_of_measurement(self):
+        return "EUR/kWh"
+
+    @property
+    def extra_state_attributes(self):
+        return _window_attributes(self._window(), self.coordinator.window_duration)
+
+class Frank2CheapestWindowTomorrowSensor(Frank2DayEntity, SensorEntity):
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Cheapest Window Tomorrow"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_cheapest_window_tomorrow"
+
+    def _window(self):
+        return self.coordinator.snapshot.window(_tomorrow_str(), self.coordinator.window_duration * 60)
+
+    @property
+    def state(self):
+        window = self._window()
+        return None if window is None else window[2]
+
+    def _data_version(self):
+        return self._window()
+
+    @property
+    def unit_of_measurement(self):
+        return "EUR/kWh"
+
+    @property
+    def extra_state_attributes(self):
+        return _window_attributes(self._window(), self.coordinator.window_duration)
+
+class Frank2CheapestWindowFutureSensor(Frank2SlotEntity, SensorEntity):
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Cheapest Window Future"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_cheapest_window_future"
+
+    def _window(self):
+        return self.coordinator.snapshot.future_window(self.coordinator.window_duration * 60)
+
+    @property
+    def state(self):
+        window = self._window()
+        return None if window is None else window[2]
+
+    def _data_version(self):
+        return self._window()
+
+    @property
+    def unit_of_measurement(self):
+        return "EUR/kWh"
+
+    @property
+    def extra_state_attributes(self):
+        return _window_attributes(self._window(), self.coordinator.window_duration)
+
+class Frank2MostExpensiveWindowFutureSensor(Frank2SlotEntity, SensorEntity):
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Most Expensive Window Future"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_most_expensive_window_future"
+
+    def _window(self):
+        return self.coordinator.snapshot.future_window(self.coordinator.window_duration * 60, highest=True)
+
+    @property
+    def state(self):
+        window = self._window()
+        return None if window is None else window[2]
 
-        diff = avg_high - avg_low
-        return round(diff, 5)
+    def _data_version(self):
+        return self._window()
 
     @property
     def unit_of_measurement(self):
@@ -649,4 +732,700 @@ class Frank2PriceDiffFutureSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self):
-        return {}
\ No newline at end of file
+        return _window_attributes(self._window(), self.coordinator.window_duration)
+
+class Frank2InCheapestWindowToday(BinarySensorEntity, Frank2SlotEntity):
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 In Cheapest Window Today"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_in_cheapest_window_today"
+
+    @property
+    def is_on(self):
+        snapshot = self.coordinator.snapshot
+        window = snapshot.window(_today_str(), self.coordinator.window_duration * 60)
+        if window is None:
+            return False
+        start = snapshot.current_start()
+        return start is not None and window[0] <= start < window[1]
+
+class Frank2BatteryScheduleSensor(Frank2SlotEntity, SensorEntity):
+    _unrecorded_attributes = frozenset({"schedule"})
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Battery Schedule"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_battery_schedule"
+
+    @property
+    def state(self):
+        plan = self.coordinator.battery_plan()
+        return None if plan is None else plan.action
+
+    def _data_version(self):
+        # The planner keeps returning the same plan object while nothing changed
+        return self.coordinator.battery_plan()
+
+    @property
+    def extra_state_attributes(self):
+        plan = self.coordinator.battery_plan()
+        if plan is None:
+            return {}
+        return {"schedule": plan.schedule}
+
+class Frank2PercentileTodaySensor(Frank2SlotEntity, SensorEntity):
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Price Percentile Today"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_price_percentile_today"
+
+    @property
+    def state(self):
+        ranked = self.coordinator.snapshot.rank("today")
+        return None if ranked is None else ranked[1]
+
+    def _data_version(self):
+        return self.coordinator.snapshot.rank("today")
+
+    @property
+    def unit_of_measurement(self):
+        return "%"
+
+    @property
+    def extra_state_attributes(self):
+        return _rank_attributes(self.coordinator.snapshot.rank("today"))
+
+class Frank2PercentileFutureSensor(Frank2SlotEntity, SensorEntity):
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Price Percentile Future"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_price_percentile_future"
+
+    @property
+    def state(self):
+        ranked = self.coordinator.snapshot.rank("future")
+        return None if ranked is None else ranked[1]
+
+    def _data_version(self):
+        return self.coordinator.snapshot.rank("future")
+
+    @property
+    def unit_of_measurement(self):
+        return "%"
+
+    @property
+    def extra_state_attributes(self):
+        return _rank_attributes(self.coordinator.snapshot.rank("future"))
+
+class Frank2PercentileHistorySensor(Frank2SlotEntity, SensorEntity):
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Price Percentile 30 Days"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_price_percentile_30_days"
+
+    @property
+    def state(self):
+        ranked = self.coordinator.snapshot.rank("history")
+        return None if ranked is None else ranked[1]
+
+    def _data_version(self):
+        return self.coordinator.snapshot.rank("history")
+
+    @property
+    def unit_of_measurement(self):
+        return "%"
+
+    @property
+    def extra_state_attributes(self):
+        return _rank_attributes(self.coordinator.snapshot.rank("history"))
+
+class Frank2BelowPercentileToday(BinarySensorEntity, Frank2SlotEntity):
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Below Percentile Today"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_below_percentile_today"
+
+    @property
+    def is_on(self):
+        ranked = self.coordinator.snapshot.rank("today")
+        return ranked is not None and ranked[1] < self.coordinator.percentile_threshold
+
+    def _data_version(self):
+        return self.coordinator.percentile_threshold
+
+    @property
+    def extra_state_attributes(self):
+        return {"threshold": self.coordinator.percentile_threshold}
+
+class Frank2BelowPercentileFuture(BinarySensorEntity, Frank2SlotEntity):
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Below Percentile Future"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_below_percentile_future"
+
+    @property
+    def is_on(self):
+        ranked = self.coordinator.snapshot.rank("future")
+        return ranked is not None and ranked[1] < self.coordinator.percentile_threshold
+
+    def _data_version(self):
+        return self.coordinator.percentile_threshold
+
+    @property
+    def extra_state_attributes(self):
+        return {"threshold": self.coordinator.percentile_threshold}
+
+class Frank2BelowPercentileHistory(BinarySensorEntity, Frank2SlotEntity):
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Below Percentile 30 Days"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_below_percentile_30_days"
+
+    @property
+    def is_on(self):
+        ranked = self.coordinator.snapshot.rank("history")
+        return ranked is not None and ranked[1] < self.coordinator.percentile_threshold
+
+    def _data_version(self):
+        return self.coordinator.percentile_threshold
+
+    @property
+    def extra_state_attributes(self):
+        return {"threshold": self.coordinator.percentile_threshold}
+
+class Frank2ForecastSensor(Frank2Entity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Forecast Electricity Price"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_forecast"
+
+    @property
+    def state(self):
+        forecast = self.coordinator.forecast
+        return None if forecast is None else forecast.average
+
+    def _data_version(self):
+        forecast = self.coordinator.forecast
+        # The error is retrained with the archive, it can change while the forecast does not
+        return None if forecast is None else (forecast.version, self.coordinator.forecaster.mae)
+
+    @property
+    def unit_of_measurement(self):
+        return "EUR/kWh"
+
+    @property
+    def extra_state_attributes(self):
+        forecast = self.coordinator.forecast
+        if forecast is None:
+            return {}
+        # Rendered points match the published ones, the flag tells them apart
+        return {**forecast.attributes(self.coordinator.price_list_attributes), "forecast": True, "mae": self.coordinator.forecaster.mae}
+
+class Frank2AverageElectricityTodayHourlySensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Average Electricity Today Hourly"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_average_electricity_today_hourly"
+
+    @property
+    def state(self):
+        day = _hourly_day(self.coordinator, _today_str())
+        if day is None:
+            return None
+        return day.average
+
+    def _data_version(self):
+        day = _hourly_day(self.coordinator, _today_str())
+        return None if day is None else day.version
+
+    @property
+    def unit_of_measurement(self):
+        return "EUR/kWh"
+
+    @property
+    def extra_state_attributes(self):
+        day = _hourly_day(self.coordinator, _today_str())
+        if day is None:
+            return {}
+        return day.attributes("points", self.coordinator.price_list_attributes)
+
+class Frank2AverageElectricityTomorrowHourlySensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Average Electricity Tomorrow Hourly"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_average_electricity_tomorrow_hourly"
+
+    @property
+    def state(self):
+        day = _hourly_day(self.coordinator, _tomorrow_str())
+        if day is None:
+            return None
+        return day.average
+
+    def _data_version(self):
+        day = _hourly_day(self.coordinator, _tomorrow_str())
+        return None if day is None else day.version
+
+    @property
+    def unit_of_measurement(self):
+        return "EUR/kWh"
+
+    @property
+    def extra_state_attributes(self):
+        day = _hourly_day(self.coordinator, _tomorrow_str())
+        if day is None:
+            return {}
+        return day.attributes("points", self.coordinator.price_list_attributes)
+
+class Frank2LowestPeriodsTodayHourlySensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Lowest Periods Today Hourly"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_lowest_periods_today_hourly"
+
+    @property
+    def state(self):
+        day = _hourly_day(self.coordinator, _today_str())
+        if day is None:
+            return None
+        return day.lowest_average
+
+    def _data_version(self):
+        day = _hourly_day(self.coordinator, _today_str())
+        return None if day is None else day.version
+
+    @property
+    def unit_of_measurement(self):
+        return "EUR/kWh"
+
+    @property
+    def extra_state_attributes(self):
+        day = _hourly_day(self.coordinator, _today_str())
+        if day is None:
+            return {}
+        return day.attributes("lowest", self.coordinator.price_list_attributes)
+
+class Frank2LowestPeriodsTomorrowHourlySensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Lowest Periods Tomorrow Hourly"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_lowest_periods_tomorrow_hourly"
+
+    @property
+    def state(self):
+        day = _hourly_day(self.coordinator, _tomorrow_str())
+        if day is None:
+            return None
+        return day.lowest_average
+
+    def _data_version(self):
+        day = _hourly_day(self.coordinator, _tomorrow_str())
+        return None if day is None else day.version
+
+    @property
+    def unit_of_measurement(self):
+        return "EUR/kWh"
+
+    @property
+    def extra_state_attributes(self):
+        day = _hourly_day(self.coordinator, _tomorrow_str())
+        if day is None:
+            return {}
+        return day.attributes("lowest", self.coordinator.price_list_attributes)
+
+class Frank2HighestPeriodsTodayHourlySensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Highest Periods Today Hourly"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_highest_periods_today_hourly"
+
+    @property
+    def state(self):
+        day = _hourly_day(self.coordinator, _today_str())
+        if day is None:
+            return None
+        return day.highest_average
+
+    def _data_version(self):
+        day = _hourly_day(self.coordinator, _today_str())
+        return None if day is None else day.version
+
+    @property
+    def unit_of_measurement(self):
+        return "EUR/kWh"
+
+    @property
+    def extra_state_attributes(self):
+        day = _hourly_day(self.coordinator, _today_str())
+        if day is None:
+            return {}
+        return day.attributes("highest", self.coordinator.price_list_attributes)
+
+class Frank2HighestPeriodsTomorrowHourlySensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Highest Periods Tomorrow Hourly"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_highest_periods_tomorrow_hourly"
+
+    @property
+    def state(self):
+        day = _hourly_day(self.coordinator, _tomorrow_str())
+        if day is None:
+            return None
+        return day.highest_average
+
+    def _data_version(self):
+        day = _hourly_day(self.coordinator, _tomorrow_str())
+        return None if day is None else day.version
+
+    @property
+    def unit_of_measurement(self):
+        return "EUR/kWh"
+
+    @property
+    def extra_state_attributes(self):
+        day = _hourly_day(self.coordinator, _tomorrow_str())
+        if day is None:
+            return {}
+        return day.attributes("highest", self.coordinator.price_list_attributes)
+
+class Frank2AverageElectricityTomorrowForecastSensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Average Electricity Tomorrow Forecast"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_average_electricity_tomorrow_forecast"
+
+    @property
+    def state(self):
+        day = _forecast_day(self.coordinator, _tomorrow_str())
+        if day is None:
+            return None
+        return day.average
+
+    def _data_version(self):
+        day = _forecast_day(self.coordinator, _tomorrow_str())
+        return None if day is None else day.version
+
+    @property
+    def unit_of_measurement(self):
+        return "EUR/kWh"
+
+    @property
+    def extra_state_attributes(self):
+        day = _forecast_day(self.coordinator, _tomorrow_str())
+        if day is None:
+            return {}
+        return {**day.attributes("points", self.coordinator.price_list_attributes), "forecast": True}
+
+class Frank2AverageElectricityDayAfterTomorrowForecastSensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Average Electricity Day After Tomorrow Forecast"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_average_electricity_day_after_tomorrow_forecast"
+
+    @property
+    def state(self):
+        day = _forecast_day(self.coordinator, _day_after_tomorrow_str())
+        if day is None:
+            return None
+        return day.average
+
+    def _data_version(self):
+        day = _forecast_day(self.coordinator, _day_after_tomorrow_str())
+        return None if day is None else day.version
+
+    @property
+    def unit_of_measurement(self):
+        return "EUR/kWh"
+
+    @property
+    def extra_state_attributes(self):
+        day = _forecast_day(self.coordinator, _day_after_tomorrow_str())
+        if day is None:
+            return {}
+        return {**day.attributes("points", self.coordinator.price_list_attributes), "forecast": True}
+
+class Frank2LowestPeriodsTomorrowForecastSensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Lowest Periods Tomorrow Forecast"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_lowest_periods_tomorrow_forecast"
+
+    @property
+    def state(self):
+        day = _forecast_day(self.coordinator, _tomorrow_str())
+        if day is None:
+            return None
+        return day.lowest_average
+
+    def _data_version(self):
+        day = _forecast_day(self.coordinator, _tomorrow_str())
+        return None if day is None else day.version
+
+    @property
+    def unit_of_measurement(self):
+        return "EUR/kWh"
+
+    @property
+    def extra_state_attributes(self):
+        day = _forecast_day(self.coordinator, _tomorrow_str())
+        if day is None:
+            return {}
+        return {**day.attributes("lowest", self.coordinator.price_list_attributes), "forecast": True}
+
+class Frank2LowestPeriodsDayAfterTomorrowForecastSensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Lowest Periods Day After Tomorrow Forecast"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_lowest_periods_day_after_tomorrow_forecast"
+
+    @property
+    def state(self):
+        day = _forecast_day(self.coordinator, _day_after_tomorrow_str())
+        if day is None:
+            return None
+        return day.lowest_average
+
+    def _data_version(self):
+        day = _forecast_day(self.coordinator, _day_after_tomorrow_str())
+        return None if day is None else day.version
+
+    @property
+    def unit_of_measurement(self):
+        return "EUR/kWh"
+
+    @property
+    def extra_state_attributes(self):
+        day = _forecast_day(self.coordinator, _day_after_tomorrow_str())
+        if day is None:
+            return {}
+        return {**day.attributes("lowest", self.coordinator.price_list_attributes), "forecast": True}
+
+class Frank2HighestPeriodsTomorrowForecastSensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Highest Periods Tomorrow Forecast"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_highest_periods_tomorrow_forecast"
+
+    @property
+    def state(self):
+        day = _forecast_day(self.coordinator, _tomorrow_str())
+        if day is None:
+            return None
+        return day.highest_average
+
+    def _data_version(self):
+        day = _forecast_day(self.coordinator, _tomorrow_str())
+        return None if day is None else day.version
+
+    @property
+    def unit_of_measurement(self):
+        return "EUR/kWh"
+
+    @property
+    def extra_state_attributes(self):
+        day = _forecast_day(self.coordinator, _tomorrow_str())
+        if day is None:
+            return {}
+        return {**day.attributes("highest", self.coordinator.price_list_attributes), "forecast": True}
+
+class Frank2HighestPeriodsDayAfterTomorrowForecastSensor(Frank2DayEntity, SensorEntity):
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
+    def __init__(self, coordinator, entry):
+        super().__init__(coordinator)
+        self._entry = entry
+
+    @property
+    def name(self):
+        return "Frank2 Highest Periods Day After Tomorrow Forecast"
+
+    @property
+    def unique_id(self):
+        return f"{self._entry.entry_id}_highest_periods_day_after_tomorrow_forecast"
+
+    @property
+    def state(self):
+        day = _forecast_day(self.coordinator, _day_after_tomorrow_str())
+        if day is None:
+            return None
+        return day.highest_average
+
+    def _data_version(self):
+        day = _forecast_day(self.coordinator, _day_after_tomorrow_str())
+        return None if day is None else day.version
+
+    @property
+    def unit_of_measurement(self):
+        return "EUR/kWh"
+
+    @property
+    def extra_state_attributes(self):
+        day = _forecast_day(self.coordinator, _day_after_tomorrow_str())
+        if day is None:
+            return {}
+        return {**day.attributes("highest", self.coordinator.price_list_attributes), "forecast": True}
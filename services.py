@@ -0,0 +1,199 @@
+from datetime import timedelta
+
+import voluptuous as vol
+
+from homeassistant.core import ServiceCall, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import get_coordinator
+from .prices import AGGREGATES, SLOT_SECONDS, render_window
+from .scheduler import Job, schedule_jobs
+from .tariff import TariffProfile, compare_profiles
+
+SERVICE_GET_PRICES = "get_prices"
+SERVICE_COMPARE_TARIFFS = "compare_tariffs"
+SERVICE_GET_WINDOW = "get_window"
+SERVICE_SCHEDULE_JOBS = "schedule_jobs"
+SERVICE_BACKFILL_ARCHIVE = "backfill_archive"
+
+
+def _slot_multiple(minutes):
+    """Resolutions must cover whole slots, a bucket never splits one."""
+    if minutes * 60 % SLOT_SECONDS:
+        raise vol.Invalid(f"resolution must be a multiple of {SLOT_SECONDS // 60} minutes")
+    return minutes
+
+
+RESOLUTION_SCHEMA = vol.All(vol.Coerce(int), vol.Range(min=SLOT_SECONDS // 60), _slot_multiple)
+
+GET_PRICES_SCHEMA = vol.Schema({
+    vol.Optional("config_entry_id"): cv.string,
+    vol.Optional("start"): cv.datetime,
+    vol.Optional("end"): cv.datetime,
+    vol.Optional("resolution"): RESOLUTION_SCHEMA,
+    vol.Optional("aggregate", default="mean"): vol.In(list(AGGREGATES)),
+    vol.Optional("include_forecast", default=False): cv.boolean,
+})
+
+GRID_FEE_SCHEMA = vol.Schema({
+    vol.Required("start"): cv.time,
+    vol.Required("end"): cv.time,
+    vol.Required("fee"): vol.Coerce(float),
+})
+
+PROFILE_SCHEMA = vol.Schema({
+    vol.Required("name"): cv.string,
+    vol.Required("inkoop"): vol.Coerce(float),
+    vol.Required("eb"): vol.Coerce(float),
+    vol.Required("btw"): vol.Coerce(float),
+    vol.Optional("grid_fees", default=[]): [GRID_FEE_SCHEMA],
+    vol.Optional("feed_in_cost", default=0.0): vol.Coerce(float),
+    vol.Optional("feed_in_vat", default=False): cv.boolean,
+    vol.Optional("netting", default=True): cv.boolean,
+})
+
+COMPARE_TARIFFS_SCHEMA = vol.Schema({
+    vol.Optional("config_entry_id"): cv.string,
+    vol.Required("profiles"): vol.All(cv.ensure_list, [PROFILE_SCHEMA]),
+})
+
+GET_WINDOW_SCHEMA = vol.Schema({
+    vol.Optional("config_entry_id"): cv.string,
+    vol.Required("duration"): vol.All(vol.Coerce(int), vol.Range(min=15)),
+    vol.Optional("scope", default="future"): vol.In(["today", "tomorrow", "future"]),
+    vol.Optional("highest", default=False): cv.boolean,
+})
+
+JOB_SCHEMA = vol.Schema({
+    vol.Required("name"): cv.string,
+    vol.Required("duration"): vol.All(vol.Coerce(int), vol.Range(min=15)),
+    vol.Required("power"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional("earliest"): cv.datetime,
+    vol.Optional("deadline"): cv.datetime,
+})
+
+SCHEDULE_JOBS_SCHEMA = vol.Schema({
+    vol.Optional("config_entry_id"): cv.string,
+    vol.Optional("max_power"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Required("jobs"): vol.All(cv.ensure_list, [JOB_SCHEMA]),
+})
+
+BACKFILL_ARCHIVE_SCHEMA = vol.Schema({
+    vol.Optional("config_entry_id"): cv.string,
+    vol.Required("start"): cv.date,
+})
+
+
+def price_range(coordinator, start=None, end=None, resolution=None, include_forecast=False, how="mean"):
+    """Prices between two datetimes, resolution in minutes aggregated with "mean", "min" or "max".
+
+    Forecast prices for the slots after the published ones are appended with
+    "forecast": true when requested.
+    """
+    start = None if start is None else dt_util.as_utc(start).timestamp()
+    end = None if end is None else dt_util.as_utc(end).timestamp()
+    resolution = None if resolution is None else resolution * 60
+    points = coordinator.snapshot.range_points(start, end, resolution, how)
+    forecast = coordinator.forecast
+    if include_forecast and forecast is not None:
+        ends = coordinator.snapshot.index.ends
+        if ends:
+            start = ends[-1] if start is None else max(start, ends[-1])
+        points += [
+            {**point, "forecast": True} for point in forecast.range_points(start, end, resolution, how)
+        ]
+    return points
+
+
+def price_window(coordinator, duration, scope="future", highest=False):
+    """Cheapest (or most expensive) contiguous window of duration minutes, or None."""
+    if scope == "future":
+        key = "future"
+    else:
+        key = (dt_util.now().date() + timedelta(days=1 if scope == "tomorrow" else 0)).strftime("%Y%m%d")
+    window = coordinator.snapshot.window(key, duration * 60, highest)
+    return None if window is None else render_window(*window)
+
+
+def _timestamp(value):
+    return None if value is None else dt_util.as_utc(value).timestamp()
+
+
+def _get_coordinator(hass, call):
+    coordinator = get_coordinator(hass, call.data.get("config_entry_id"))
+    if coordinator is None:
+        raise ServiceValidationError(f"No loaded {DOMAIN} config entry found")
+    return coordinator
+
+
+def async_setup_services(hass):
+    async def async_get_prices(call: ServiceCall):
+        coordinator = _get_coordinator(hass, call)
+        return {
+            "prices": price_range(
+                coordinator, call.data.get("start"), call.data.get("end"), call.data.get("resolution"),
+                call.data["include_forecast"], call.data["aggregate"]
+            )
+        }
+
+    async def async_get_window(call: ServiceCall):
+        coordinator = _get_coordinator(hass, call)
+        return {
+            "window": price_window(
+                coordinator, call.data["duration"], call.data["scope"], call.data["highest"]
+            )
+        }
+
+    async def async_schedule_jobs(call: ServiceCall):
+        coordinator = _get_coordinator(hass, call)
+        names = [job["name"] for job in call.data["jobs"]]
+        if len(set(names)) != len(names):
+            raise ServiceValidationError("Job names must be unique")
+        jobs = [
+            Job(job["name"], job["duration"] * 60, job["power"],
+                _timestamp(job.get("earliest")), _timestamp(job.get("deadline")))
+            for job in call.data["jobs"]
+        ]
+        return await hass.async_add_executor_job(
+            schedule_jobs, coordinator.snapshot, jobs, call.data.get("max_power")
+        )
+
+    async def async_backfill_archive(call: ServiceCall):
+        coordinator = _get_coordinator(hass, call)
+        coordinator.source.async_start_backfill(dt_util.start_of_local_day(call.data["start"]))
+
+    async def async_compare_tariffs(call: ServiceCall):
+        coordinator = _get_coordinator(hass, call)
+        profiles = [TariffProfile(**profile) for profile in call.data["profiles"]]
+        current = coordinator.tariff
+        profiles.insert(0, TariffProfile(current.inkoop, current.eb, current.btw, current.grid_fees,
+                                         current.feed_in_cost, current.feed_in_vat, current.netting, "current"))
+        # The net prices are shared, comparing profiles never fetches anything
+        return {
+            "profiles": await hass.async_add_executor_job(
+                compare_profiles, profiles, dict(coordinator.source.days)
+            )
+        }
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_GET_PRICES, async_get_prices,
+        schema=GET_PRICES_SCHEMA, supports_response=SupportsResponse.ONLY
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_GET_WINDOW, async_get_window,
+        schema=GET_WINDOW_SCHEMA, supports_response=SupportsResponse.ONLY
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SCHEDULE_JOBS, async_schedule_jobs,
+        schema=SCHEDULE_JOBS_SCHEMA, supports_response=SupportsResponse.ONLY
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL_ARCHIVE, async_backfill_archive, schema=BACKFILL_ARCHIVE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_COMPARE_TARIFFS, async_compare_tariffs,
+        schema=COMPARE_TARIFFS_SCHEMA, supports_response=SupportsResponse.ONLY
+    )
@@ -0,0 +1,317 @@
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+import aiohttp
+
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .archive import PriceArchive
+from .const import (
+    API_URL,
+    ARCHIVE_CHUNK_DAYS,
+    ARCHIVE_PARALLEL_CHUNKS,
+    DOMAIN,
+    MAX_PARALLEL_REQUESTS,
+    MIN_REQUEST_INTERVAL,
+    REQUEST_TIMEOUT,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .entsoe import A44Parser, expand_period
+from .prices import SLOT_SECONDS, PriceSeries, split_days
+
+_LOGGER = logging.getLogger(__name__)
+
+CHUNK_SIZE = 16384
+
+
+class RequestLimiter:
+    """Bounds concurrent ENTSO-E requests and spaces out their starts, shared by all zones."""
+
+    def __init__(self, max_parallel=MAX_PARALLEL_REQUESTS, min_interval=MIN_REQUEST_INTERVAL):
+        self._semaphore = asyncio.Semaphore(max_parallel)
+        self._lock = asyncio.Lock()
+        self._min_interval = min_interval
+        self._next_start = 0.0
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        async with self._lock:
+            delay = self._next_start - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_start = time.monotonic() + self._min_interval
+
+    async def __aexit__(self, *exc_info):
+        self._semaphore.release()
+
+
+def _domain_data(hass):
+    return hass.data.setdefault(DOMAIN, {"sources": {}, "limiter": RequestLimiter()})
+
+
+def async_acquire_source(hass, token, zone):
+    """Shared price source for a bidding zone, created on first use.
+
+    Prices are the same for every token, so entries with different tokens on
+    one zone share the source, its Store and its archive as well.
+    """
+    sources = _domain_data(hass)["sources"]
+    source = sources.get(zone)
+    if source is None:
+        source = sources[zone] = PriceSource(hass, zone)
+    source.tokens.append(token)
+    return source
+
+
+async def async_release_source(hass, source, token):
+    """Stop using the source, the last entry cancels its backfill and unmaps its archive."""
+    source.tokens.remove(token)
+    if not source.tokens:
+        _domain_data(hass)["sources"].pop(source.zone, None)
+        if source.backfill_task is not None:
+            source.backfill_task.cancel()
+        await hass.async_add_executor_job(source.archive.close)
+
+
+class PriceSource:
+    """Net day-ahead prices of one bidding zone, fetched once for every config entry using it.
+
+    Days are cached per local delivery day in a Store, complete days are never
+    fetched again and concurrent requests for the same days share one fetch.
+    Requests use the token of the first entry still using the source.
+    """
+
+    def __init__(self, hass, zone):
+        self.hass = hass
+        self.zone = zone
+        # Tokens of the config entries using the source, one per entry
+        self.tokens = []
+        # Net prices per delivery day, in both price columns
+        self.days = {}
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{zone}")
+        self._load_task = None
+        self._fetches = {}
+        # Net prices of past days, filled by backfills and by days as they pass
+        self.archive = PriceArchive(hass.config.path(".storage", f"{DOMAIN}.{zone}.archive"))
+        self.backfill_task = None
+
+    async def async_load(self):
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load())
+        await self._load_task
+
+    async def _async_load(self):
+        stored = await self._store.async_load() or {}
+        for date_str, day in stored.get("days", {}).items():
+            self.days[date_str] = PriceSeries(
+                day["start"], day["resolution"], day["prices"], day["prices"], day.get("starts")
+            )
+
+    def is_complete(self, date):
+        """Whether the day was fetched up to its last slot.
+
+        Days are always requested whole, so positions missing before the last
+        one were not published and refetching will not fill them.
+        """
+        series = self.days.get(date.strftime("%Y%m%d"))
+        if series is None:
+            return False
+        return series.end >= dt_util.start_of_local_day(date + timedelta(days=1)).timestamp()
+
+    async def async_ensure_days(self, dates):
+        """Fetch the given local days unless they are complete already."""
+        missing = [date for date in dates if not self.is_complete(date)]
+        if not missing:
+            return
+        key = (missing[0], missing[-1])
+        fetch = self._fetches.get(key)
+        if fetch is None:
+            fetch = self._fetches[key] = self.hass.async_create_task(self._async_fetch_days(missing))
+            fetch.add_done_callback(lambda _: self._fetches.pop(key, None))
+        await asyncio.shield(fetch)
+
+    async def _async_fetch_days(self, missing):
+        # One request for the missing local market days, split afterwards
+        start = dt_util.start_of_local_day(missing[0])
+        end = dt_util.start_of_local_day(missing[-1] + timedelta(days=1))
+        periods = await self.async_fetch_range(start, end)
+        days = await self.hass.async_add_executor_job(self._build_days, periods) if periods else None
+        if days:
+            self.days.update(days)
+            await self._async_save()
+        else:
+            _LOGGER.debug(f"Keeping previously fetched data for {self.zone}")
+
+    def _build_days(self, periods):
+        """Turn parsed periods into one net price series per local delivery day."""
+        return split_days(_merge_periods(periods))
+
+    async def _async_save(self):
+        today = dt_util.now().date().strftime("%Y%m%d")
+        past = [self.days.pop(date_str) for date_str in sorted(self.days) if date_str < today]
+        self._store.async_delay_save(lambda: {
+            "days": {
+                date_str: {
+                    "start": series.start,
+                    "resolution": series.resolution,
+                    "prices": series.net_prices.tolist(),
+                    **({} if series.dense else {"starts": series.starts.tolist()}),
+                }
+                for date_str, series in self.days.items()
+            }
+        }, STORAGE_SAVE_DELAY)
+        if past and self.backfill_task is None:
+            # A running backfill covers up to today itself, appending now would skip its later chunks.
+            # Days after a gap in the archive are left to the next backfill as well.
+            records = [
+                (series.start_at(i), series.resolution, price)
+                for series in past
+                for i, price in enumerate(series.net_prices)
+            ]
+            try:
+                await self.hass.async_add_executor_job(self.archive.extend, records)
+            except OSError as err:
+                _LOGGER.error(f"Archiving past days of {self.zone} failed: {err}")
+
+    def async_start_backfill(self, start):
+        """Backfill the archive from start up to today in the background, unless already running."""
+        if self.backfill_task is None:
+            self.backfill_task = self.hass.async_create_background_task(
+                self.async_backfill(start), f"{DOMAIN} {self.zone} archive backfill"
+            )
+            self.backfill_task.add_done_callback(self._backfill_done)
+        return self.backfill_task
+
+    def _backfill_done(self, task):
+        self.backfill_task = None
+        if not task.cancelled() and task.exception() is not None:
+            _LOGGER.error(f"Archive backfill for {self.zone} failed: {task.exception()}")
+
+    async def async_backfill(self, start, end=None):
+        """Fetch past days into the archive, resuming where an earlier run stopped.
+
+        History before the archive's first record is collected in a separate
+        file that replaces the archive once it reaches it, the archive itself
+        only ever grows at the end. Returns the number of slots written.
+        """
+        if end is None:
+            end = dt_util.start_of_local_day()
+        written = 0
+        archive_start = await self.hass.async_add_executor_job(lambda: self.archive.start)
+        if archive_start is not None and start.timestamp() < archive_start:
+            first_day = dt_util.start_of_local_day(dt_util.as_local(dt_util.utc_from_timestamp(archive_start)))
+            staging = PriceArchive(f"{self.archive.path}.backfill")
+            written += await self._async_backfill_into(staging, start, first_day)
+            staging_end = await self.hass.async_add_executor_job(lambda: staging.end)
+            if staging_end is None or staging_end < first_day.timestamp():
+                return written
+            await self.hass.async_add_executor_job(self.archive.prepend, staging)
+        return written + await self._async_backfill_into(self.archive, start, end)
+
+    async def _async_backfill_into(self, archive, start, end):
+        """Fetch [start, end) in local day chunks, ARCHIVE_PARALLEL_CHUNKS at a time.
+
+        Chunks go through the shared rate limiter and are written strictly in
+        order, so an interruption leaves a complete prefix to resume from.
+        """
+        resume = await self.hass.async_add_executor_job(lambda: archive.end)
+        if resume is not None:
+            start = max(start, dt_util.utc_from_timestamp(resume))
+        chunks = []
+        day = dt_util.as_local(start).date()
+        last = dt_util.as_local(end).date()
+        while day < last:
+            next_day = min(day + timedelta(days=ARCHIVE_CHUNK_DAYS), last)
+            chunks.append((dt_util.start_of_local_day(day), dt_util.start_of_local_day(next_day)))
+            day = next_day
+        semaphore = asyncio.Semaphore(ARCHIVE_PARALLEL_CHUNKS)
+
+        async def fetch(chunk_start, chunk_end):
+            async with semaphore:
+                return await self.async_fetch_range(chunk_start, chunk_end)
+
+        tasks = [self.hass.async_create_task(fetch(*chunk)) for chunk in chunks]
+        written = 0
+        try:
+            for (chunk_start, chunk_end), task in zip(chunks, tasks):
+                periods = await task
+                if periods is None:
+                    _LOGGER.warning(f"Archive backfill for {self.zone} stopped at {chunk_start}, the next run resumes there")
+                    break
+                written += await self.hass.async_add_executor_job(
+                    _archive_chunk, archive, periods, chunk_start.timestamp(), chunk_end.timestamp()
+                )
+                _LOGGER.debug(f"Archived {self.zone} up to {chunk_end}")
+        finally:
+            for task in tasks:
+                task.cancel()
+        return written
+
+    async def async_fetch_range(self, start, end):
+        """Fetch the A44 periods between two aware datetimes.
+
+        Only the network I/O runs on the event loop, every chunk is parsed in the
+        executor as it arrives.
+        """
+        period_start = dt_util.as_utc(start).strftime("%Y%m%d%H%M")
+        period_end = dt_util.as_utc(end).strftime("%Y%m%d%H%M")
+        url = f"{API_URL}?securityToken={self.tokens[0]}&documentType=A44&in_Domain={self.zone}&out_Domain={self.zone}&periodStart={period_start}&periodEnd={period_end}"
+        session = async_get_clientsession(self.hass)
+        try:
+            async with _domain_data(self.hass)["limiter"]:
+                _LOGGER.debug(f"Fetching {self.zone} data for {period_start}-{period_end}")
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)) as resp:
+                    _LOGGER.debug(f"Response status for {period_start}-{period_end}: {resp.status}")
+                    if resp.status != 200:
+                        _LOGGER.warning(f"Failed to fetch data for {period_start}-{period_end}: {resp.status}")
+                        return None
+                    parser = A44Parser()
+                    async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                        await self.hass.async_add_executor_job(parser.feed, chunk)
+                    await self.hass.async_add_executor_job(parser.close)
+        except Exception as e:
+            _LOGGER.error(f"Error fetching data for {period_start}-{period_end}: {e}")
+            return None
+        _LOGGER.debug(f"Parsed {parser.points} points in {len(parser.periods)} periods for {period_start}-{period_end}")
+        if not parser.periods:
+            _LOGGER.debug(f"No TimeSeries found in XML for {period_start}-{period_end}")
+        return parser.periods
+
+
+def _merge_periods(periods):
+    """Merge every TimeSeries and Period into dense SLOT_SECONDS series of net prices (EUR/kWh).
+
+    Hourly periods are repeated per quarter hour, where blocks overlap the one
+    sent last wins. Returns one series per run of contiguous slots.
+    """
+    prices = {}
+    for period in periods:
+        starts, amounts = expand_period(period, SLOT_SECONDS)
+        prices.update(zip(starts, amounts))
+    series_list = []
+    series = None
+    for start in sorted(prices):
+        if series is None or start != series.end:
+            series = PriceSeries(start, SLOT_SECONDS)
+            series_list.append(series)
+        price_kwh = prices[start] / 1000
+        series.append(price_kwh, price_kwh)
+    return series_list
+
+
+def _archive_chunk(archive, periods, start, end):
+    records = []
+    for series in _merge_periods(periods):
+        for i, price in enumerate(series.net_prices):
+            slot_start = series.start_at(i)
+            if start <= slot_start < end:
+                records.append((slot_start, series.resolution, price))
+    written = archive.append(records)
+    # Also covers the parts of the chunk without prices, so they are not fetched again
+    archive.mark(int(start), int(end))
+    return written
@@ -0,0 +1,156 @@
+from array import array
+from datetime import datetime, time
+
+from homeassistant.util import dt as dt_util
+
+from .prices import SLOT_SECONDS, PriceSeries, average
+
+SLOTS_PER_DAY = 24 * 3600 // SLOT_SECONDS
+
+
+def grid_fee_table(grid_fees):
+    """Fee per quarter hour of the local day from [{"start", "end", "fee"}] periods.
+
+    Periods may wrap around midnight, later periods override earlier ones.
+    """
+    table = [0.0] * SLOTS_PER_DAY
+    for period in grid_fees or ():
+        start = _slot_of_day(period["start"])
+        end = _slot_of_day(period["end"]) or SLOTS_PER_DAY
+        slots = range(start, end) if start < end else [*range(start, SLOTS_PER_DAY), *range(end)]
+        for slot in slots:
+            table[slot] = period["fee"]
+    return table
+
+
+def parse_grid_fees(text):
+    """Grid fee periods from "HH:MM-HH:MM=fee" entries separated by semicolons.
+
+    Raises ValueError for an entry that is not a valid period.
+    """
+    periods = []
+    for entry in (text or "").split(";"):
+        if not entry.strip():
+            continue
+        span, _, fee = entry.partition("=")
+        start, _, end = span.partition("-")
+        start, end = start.strip(), end.strip()
+        time.fromisoformat(start)
+        time.fromisoformat(end)
+        periods.append({"start": start, "end": end, "fee": float(fee.replace(",", "."))})
+    return periods
+
+
+def _slot_of_day(value):
+    if isinstance(value, str):
+        value = time.fromisoformat(value)
+    return (value.hour * 3600 + value.minute * 60) // SLOT_SECONDS
+
+
+class TariffProfile:
+    """Supplier tariff turning net day-ahead prices (EUR/kWh) into consumer prices.
+
+    buy  = net * (1 + btw / 100) + inkoop + eb + grid fee of the local quarter hour
+    sell = buy when netting ("salderen"), otherwise
+           net * (1 + btw / 100 if feed_in_vat else 1) - feed_in_cost
+    """
+
+    def __init__(self, inkoop, eb, btw, grid_fees=None, feed_in_cost=0.0, feed_in_vat=False,
+                 netting=True, name=None):
+        self.name = name
+        self.inkoop = inkoop
+        self.eb = eb
+        self.btw = btw
+        self.grid_fees = grid_fees or []
+        self.feed_in_cost = feed_in_cost
+        self.feed_in_vat = feed_in_vat
+        self.netting = netting
+        self._transform = None
+
+    @classmethod
+    def from_entry_data(cls, data):
+        return cls(
+            data["inkoop"], data["eb"], data["btw"], parse_grid_fees(data.get("grid_fees")),
+            data.get("feed_in_cost", 0.0), data.get("feed_in_vat", False), data.get("netting", True)
+        )
+
+    def _key(self):
+        grid_fees = tuple((str(p["start"]), str(p["end"]), p["fee"]) for p in self.grid_fees)
+        return (self.inkoop, self.eb, self.btw, grid_fees, self.feed_in_cost, self.feed_in_vat, self.netting)
+
+    def __eq__(self, other):
+        return isinstance(other, TariffProfile) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def compile(self):
+        """Transform (slot starts, net prices) -> (buy prices, sell prices) for a whole series."""
+        if self._transform is not None:
+            return self._transform
+        scale = 1 + self.btw / 100
+        offset = self.inkoop + self.eb
+        sell_scale = scale if self.feed_in_vat else 1.0
+        sell_offset = -self.feed_in_cost
+        fees = grid_fee_table(self.grid_fees) if self.grid_fees else None
+        netting = self.netting
+
+        def transform(starts, net_prices):
+            if fees is None:
+                buy = array("d", [round(p * scale + offset, 5) for p in net_prices])
+            else:
+                buy = array("d", [
+                    round(p * scale + offset + fee, 5)
+                    for p, fee in zip(net_prices, _slot_fees(fees, starts))
+                ])
+            if netting:
+                return buy, buy
+            sell = array("d", [round(p * sell_scale + sell_offset, 5) for p in net_prices])
+            return buy, sell
+
+        self._transform = transform
+        return transform
+
+    def apply(self, series):
+        """All-in PriceSeries for a net price series, with the feed-in prices when not netting."""
+        buy, sell = self.compile()(series.starts, series.net_prices)
+        return PriceSeries(series.start, series.resolution, buy, series.net_prices,
+                           None if series.dense else series.starts, None if sell is buy else sell)
+
+    def apply_records(self, records):
+        """All-in prices for archived (start, seconds, net price) records, in record order."""
+        starts = array("q")
+        net_prices = array("d")
+        for start, _, price in records:
+            starts.append(start)
+            net_prices.append(price)
+        return self.compile()(starts, net_prices)[0]
+
+    def summarize(self, days):
+        """Average buy and sell price per delivery day."""
+        transform = self.compile()
+        summary = {}
+        for date_str, series in days.items():
+            buy, sell = transform(series.starts, series.net_prices)
+            summary[date_str] = {"average": average(buy), "feed_in_average": average(sell)}
+        return summary
+
+
+def _slot_fees(fees, starts):
+    """Grid fee per slot start, looked up by local quarter hour of day."""
+    if not len(starts):
+        return []
+    tz = dt_util.get_default_time_zone()
+    offset = datetime.fromtimestamp(starts[0], tz).utcoffset().total_seconds()
+    if offset == datetime.fromtimestamp(starts[-1], tz).utcoffset().total_seconds():
+        # No DST switch inside the series, one offset for every slot
+        return [fees[int((t + offset) % 86400) // SLOT_SECONDS] for t in starts]
+    return [
+        fees[int((t + datetime.fromtimestamp(t, tz).utcoffset().total_seconds()) % 86400) // SLOT_SECONDS]
+        for t in starts
+    ]
+
+
+def compare_profiles(profiles, days):
+    """Per profile average buy and sell price per day, all computed from the same net prices."""
+    return {profile.name: profile.summarize(days) for profile in profiles}
@@ -0,0 +1,62 @@
+"""Test setup, the repository root is the frank2 integration package."""
+import importlib.util
+import sys
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from entsoe_server import EntsoeServer
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def _load_integration():
+    spec = importlib.util.spec_from_file_location(
+        "frank2", ROOT / "__init__.py", submodule_search_locations=[str(ROOT)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["frank2"] = module
+    spec.loader.exec_module(module)
+
+
+if "frank2" not in sys.modules:
+    _load_integration()
+
+from frank2.const import DEFAULT_ZONE, DOMAIN, MAX_PARALLEL_REQUESTS  # noqa: E402
+from frank2.source import RequestLimiter, async_acquire_source, async_release_source  # noqa: E402
+
+
+@pytest.fixture
+def amsterdam():
+    """Delivery days of the fixtures are Dutch market days."""
+    previous = dt_util.get_default_time_zone()
+    dt_util.set_default_time_zone(ZoneInfo("Europe/Amsterdam"))
+    yield
+    dt_util.set_default_time_zone(previous)
+
+
+@pytest.fixture
+async def entsoe_server(socket_enabled, monkeypatch):
+    """Stand-in ENTSO-E API on localhost, the source fetches from it."""
+    server = EntsoeServer()
+    await server.start()
+    monkeypatch.setattr("frank2.source.API_URL", server.url)
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+async def source(hass, tmp_path, entsoe_server):
+    """Source of the Dutch zone fetching from the stand-in server, its archive lives in tmp_path."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / ".storage").mkdir()
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    # No spacing between requests, tests that check the limits install their own limiter
+    hass.data[DOMAIN] = {"sources": {}, "limiter": RequestLimiter(MAX_PARALLEL_REQUESTS, 0)}
+    source = async_acquire_source(hass, "token", DEFAULT_ZONE)
+    yield source
+    await async_release_source(hass, source, "token")
@@ -0,0 +1,134 @@
+"""Local stand-in for the ENTSO-E transparency API, serving generated A44 documents."""
+import asyncio
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+NAMESPACE = "urn:iec62325.351:tc57wg16:451-3:publicationdocument:7:3"
+ZONE = "10YNL----------L"
+SLOT_SECONDS = 15 * 60
+# Written per chunk of the response so the client parses it incrementally
+RESPONSE_CHUNK = 8192
+
+
+def price_at(start):
+    """Deterministic EUR/MWh price of the quarter hour starting at start."""
+    return float(start // SLOT_SECONDS % 97)
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%MZ")
+
+
+def _epoch(value):
+    return int(datetime.strptime(value, "%Y%m%d%H%M").replace(tzinfo=timezone.utc).timestamp())
+
+
+def a44_body(bounds, price, missing=()):
+    """A44 document with a PT15M A01 TimeSeries for every consecutive pair of epoch bounds.
+
+    price gives the EUR/MWh price of the quarter hour starting at an epoch.
+    Slots inside any of the missing (start, end) ranges are left out, a
+    series without any slot is left out as a whole like ENTSO-E does. The
+    benchmarks build their documents with it as well.
+    """
+    series = []
+    for start, end in zip(bounds, bounds[1:]):
+        points = [
+            f"<Point><position>{i + 1}</position><price.amount>{price(t):.2f}</price.amount></Point>"
+            for i, t in enumerate(range(start, end, SLOT_SECONDS))
+            if not any(lo <= t < hi for lo, hi in missing)
+        ]
+        if points:
+            series.append(
+                f"<TimeSeries><mRID>{len(series) + 1}</mRID><auction.type>A01</auction.type>"
+                f"<businessType>A62</businessType>"
+                f"<in_Domain.mRID codingScheme=\"A01\">{ZONE}</in_Domain.mRID>"
+                f"<out_Domain.mRID codingScheme=\"A01\">{ZONE}</out_Domain.mRID>"
+                "<contract_MarketAgreement.type>A01</contract_MarketAgreement.type>"
+                "<currency_Unit.name>EUR</currency_Unit.name><price_Measure_Unit.name>MWH</price_Measure_Unit.name>"
+                "<curveType>A01</curveType>"
+                f"<Period><timeInterval><start>{_iso(start)}</start><end>{_iso(end)}</end></timeInterval>"
+                f"<resolution>PT15M</resolution>{''.join(points)}</Period></TimeSeries>"
+            )
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>\n<Publication_MarketDocument xmlns="{NAMESPACE}">'
+        "<mRID>1</mRID><revisionNumber>1</revisionNumber><type>A44</type>"
+        f"<period.timeInterval><start>{_iso(bounds[0])}</start><end>{_iso(bounds[-1])}</end></period.timeInterval>"
+        f"{''.join(series)}</Publication_MarketDocument>"
+    ).encode()
+
+
+def a44_document(start, end, missing=()):
+    """A44 document with one period over [start, end), priced by price_at.
+
+    Documents are cached, a test can build a large one before the server is
+    asked for it.
+    """
+    return _a44_document(int(start), int(end), tuple(missing))
+
+
+@lru_cache(maxsize=16)
+def _a44_document(start, end, missing):
+    return a44_body((start, end), price_at, missing)
+
+
+class EntsoeServer:
+    """Answers periodStart/periodEnd requests and records them.
+
+    fail holds periodStart values answered with 503, missing holds (start,
+    end) epoch ranges without published prices and delay postpones every
+    answer. The peers and the highest number of requests in flight are kept
+    to check connection reuse and concurrency limits.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.fail = set()
+        self.missing = []
+        self.delay = 0.0
+        self.peers = set()
+        self.active = 0
+        self.max_active = 0
+        app = web.Application()
+        app.router.add_get("/api", self._handle)
+        self._server = TestServer(app)
+
+    @property
+    def url(self):
+        return str(self._server.make_url("/api"))
+
+    @property
+    def ranges(self):
+        """(start, end) epoch of every request, in arrival order."""
+        return [(_epoch(query["periodStart"]), _epoch(query["periodEnd"])) for query in self.requests]
+
+    async def start(self):
+        await self._server.start_server()
+
+    async def close(self):
+        await self._server.close()
+
+    async def _handle(self, request):
+        self.requests.append(dict(request.query))
+        self.peers.add(request.transport.get_extra_info("peername"))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            if request.query["periodStart"] in self.fail:
+                return web.Response(status=503)
+            body = a44_document(
+                _epoch(request.query["periodStart"]), _epoch(request.query["periodEnd"]), self.missing
+            )
+            response = web.StreamResponse(headers={"Content-Type": "text/xml"})
+            await response.prepare(request)
+            for i in range(0, len(body), RESPONSE_CHUNK):
+                await response.write(body[i:i + RESPONSE_CHUNK])
+            await response.write_eof()
+            return response
+        finally:
+            self.active -= 1
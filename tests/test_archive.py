@@ -0,0 +1,146 @@
+"""Price archive storage and backfill against the stand-in ENTSO-E server."""
+import math
+import os
+import threading
+from datetime import date
+
+from homeassistant.util import dt as dt_util
+
+from entsoe_server import price_at
+from frank2.archive import RECORD, PriceArchive
+from frank2.const import ARCHIVE_CHUNK_DAYS
+
+SLOT = 900
+
+
+def local_day(year, month, day):
+    return dt_util.start_of_local_day(date(year, month, day))
+
+
+def assert_contiguous(archive, start, end):
+    """Records cover [start, end) in order without overlaps, priced records match the server."""
+    expected = start
+    for record_start, seconds, price in RECORD.iter_unpack(archive.read()):
+        assert record_start == expected
+        if not math.isnan(price):
+            assert price == price_at(record_start) / 1000
+        expected = record_start + seconds
+    assert expected == end
+
+
+def test_append_skips_records_before_the_end(tmp_path):
+    archive = PriceArchive(str(tmp_path / "archive"))
+    assert archive.append([(0, SLOT, 1.0), (SLOT, SLOT, 2.0)]) == 2
+    assert archive.append([(SLOT, SLOT, 5.0), (2 * SLOT, SLOT, 3.0)]) == 1
+    assert list(archive.records()) == [(0, SLOT, 1.0), (SLOT, SLOT, 2.0), (2 * SLOT, SLOT, 3.0)]
+    assert list(archive.prices(SLOT, 3 * SLOT)) == [2.0, 3.0]
+
+
+def test_extend_leaves_a_gap_to_the_backfill(tmp_path):
+    archive = PriceArchive(str(tmp_path / "archive"))
+    assert archive.extend([(0, SLOT, 1.0)]) == 1
+    # Starts after the end, appending would make the gap unreachable for a backfill
+    assert archive.extend([(3 * SLOT, SLOT, 4.0)]) == 0
+    assert archive.extend([(SLOT, SLOT, 2.0)]) == 1
+    assert archive.end == 2 * SLOT
+
+
+def test_concurrent_appends_stay_sorted(tmp_path):
+    archive = PriceArchive(str(tmp_path / "archive"))
+    records = [(i * SLOT, SLOT, float(i)) for i in range(2000)]
+
+    def writer(offset):
+        for i in range(offset, len(records), 50):
+            archive.append(records[i:i + 50])
+
+    threads = [threading.Thread(target=writer, args=(0,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert list(archive.records()) == records
+
+
+def test_close_keeps_views_in_use(tmp_path):
+    archive = PriceArchive(str(tmp_path / "archive"))
+    archive.append([(0, SLOT, 1.0), (SLOT, SLOT, 2.0)])
+    view = archive.read()
+    archive.close()
+    # The view keeps its map, the archive maps the file again on the next read
+    assert RECORD.unpack_from(view, RECORD.size) == (SLOT, SLOT, 2.0)
+    view.release()
+    archive.close()
+    assert archive._map is None
+    assert list(archive.prices()) == [1.0, 2.0]
+
+
+async def test_backfill_fetches_in_chunks(source, entsoe_server):
+    start, end = local_day(2025, 1, 1), local_day(2025, 3, 15)
+    written = await source.async_backfill(start, end)
+
+    assert written == (end - start).total_seconds() // SLOT
+    ranges = sorted(entsoe_server.ranges)
+    assert len(ranges) == 3
+    assert all(hi - lo <= ARCHIVE_CHUNK_DAYS * 86400 for lo, hi in ranges)
+    assert ranges[0][0] == start.timestamp() and ranges[-1][1] == end.timestamp()
+    assert_contiguous(source.archive, start.timestamp(), end.timestamp())
+
+
+async def test_backfill_resumes_after_an_interruption(source, entsoe_server):
+    start, end = local_day(2025, 1, 1), local_day(2025, 3, 15)
+    second_chunk = local_day(2025, 2, 1)
+    entsoe_server.fail.add(dt_util.as_utc(second_chunk).strftime("%Y%m%d%H%M"))
+
+    written = await source.async_backfill(start, end)
+    # The third chunk was fetched as well, but chunks are only written in order
+    assert written == (second_chunk - start).total_seconds() // SLOT
+    assert source.archive.end == second_chunk.timestamp()
+
+    entsoe_server.fail.clear()
+    entsoe_server.requests.clear()
+    await source.async_backfill(start, end)
+    assert min(lo for lo, _ in entsoe_server.ranges) == second_chunk.timestamp()
+    assert_contiguous(source.archive, start.timestamp(), end.timestamp())
+
+
+async def test_backfill_marks_spans_without_prices(source, entsoe_server):
+    start, empty, end = local_day(2025, 1, 1), local_day(2025, 2, 1), local_day(2025, 3, 1)
+    # The second chunk has no published prices at all
+    entsoe_server.missing.append((empty.timestamp(), end.timestamp()))
+
+    written = await source.async_backfill(start, end)
+    assert written == (empty - start).total_seconds() // SLOT
+    # A NaN record covers the empty chunk, priced reads skip it
+    last = list(RECORD.iter_unpack(source.archive.read(empty.timestamp())))
+    assert len(last) == 1 and math.isnan(last[0][2])
+    assert last[0][:2] == (empty.timestamp(), (end - empty).total_seconds())
+    assert list(source.archive.records(empty.timestamp())) == []
+    assert_contiguous(source.archive, start.timestamp(), end.timestamp())
+
+    # The whole range is covered now, nothing is left to fetch
+    entsoe_server.requests.clear()
+    assert await source.async_backfill(start, end) == 0
+    assert entsoe_server.requests == []
+
+
+async def test_backfill_before_the_archive_goes_through_staging(source, entsoe_server):
+    early, start, end = local_day(2025, 1, 1), local_day(2025, 2, 1), local_day(2025, 3, 1)
+    await source.async_backfill(start, end)
+    entsoe_server.requests.clear()
+
+    await source.async_backfill(early, end)
+    # Only the missing month was fetched, then prepended to the archive
+    assert entsoe_server.ranges == [(early.timestamp(), start.timestamp())]
+    assert source.archive.start == early.timestamp()
+    assert not os.path.exists(f"{source.archive.path}.backfill")
+    assert_contiguous(source.archive, early.timestamp(), end.timestamp())
+
+
+async def test_past_days_are_archived_before_the_fetch_returns(source):
+    today = dt_util.now().date()
+    yesterday = date.fromordinal(today.toordinal() - 1)
+    await source.async_ensure_days([yesterday, today])
+    # Yesterday moved from the Store to the archive, today stays in the Store
+    assert yesterday.strftime("%Y%m%d") not in source.days
+    assert source.archive.start == dt_util.start_of_local_day(yesterday).timestamp()
+    assert source.archive.end == dt_util.start_of_local_day(today).timestamp()
@@ -0,0 +1,76 @@
+"""Battery planner against a brute force search over every action sequence."""
+import itertools
+import random
+from datetime import date
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from frank2.battery import BatteryPlanner
+from frank2.prices import SLOT_SECONDS, PriceSeries, PriceSnapshot
+
+pytestmark = pytest.mark.usefixtures("amsterdam")
+
+SLOTS = 7
+
+
+def snapshot_of(prices):
+    start = int(dt_util.start_of_local_day(date(2025, 3, 10)).timestamp())
+    return PriceSnapshot({"20250310": PriceSeries(start, SLOT_SECONDS, prices, prices)}, 4, 4), start
+
+
+def brute_force(planner, prices, level):
+    """Lowest cost over all charge/idle/discharge sequences, with the planner's cost model."""
+    step = planner.capacity / planner.levels
+    eta = (planner.efficiency / 100) ** 0.5
+    hours = SLOT_SECONDS / 3600
+    up = int(planner.charge_power * hours / step + 1e-9)
+    down = int(planner.discharge_power * hours / step + 1e-9)
+    # Leftover energy is valued at the rounded average price, like average() in the planner
+    terminal = round(sum(prices) / len(prices), 5)
+    best = None
+    for actions in itertools.product((0, up, -down), repeat=len(prices)):
+        s = level
+        cost = 0.0
+        for move, price in zip(actions, prices):
+            to = min(planner.levels, max(0, s + move))
+            cost += (to - s) * step * (price / eta if to > s else price * eta)
+            s = to
+        cost -= s * step * eta * terminal
+        best = cost if best is None else min(best, cost)
+    return best
+
+
+@pytest.mark.parametrize(
+    ("capacity", "charge_power", "discharge_power", "levels", "soc"),
+    [
+        (10.0, 3.0, 3.0, 20, 50),
+        (10.0, 3.0, 1.5, 20, 0),
+        (5.0, 11.0, 11.0, 10, 100),
+        # 0.0125 kWh per quarter hour, finer levels are derived from the power
+        (1.0, 0.05, 0.05, None, 0),
+    ],
+)
+def test_plan_matches_brute_force(capacity, charge_power, discharge_power, levels, soc):
+    rng = random.Random(f"{capacity}-{charge_power}-{discharge_power}-{soc}")
+    for _ in range(5):
+        prices = [round(rng.uniform(-0.05, 0.4), 5) for _ in range(SLOTS)]
+        snapshot, start = snapshot_of(prices)
+        planner = BatteryPlanner(capacity, charge_power, discharge_power, 90.0, levels=levels)
+        policy = planner.solve(snapshot, start)
+        level = round(soc * planner.levels / 100)
+        assert policy.values[level] == pytest.approx(brute_force(planner, prices, level), abs=1e-9)
+
+
+@pytest.mark.parametrize(("capacity", "power"), [(10.0, 3.0), (10.0, 0.05), (10.0, 11.0)])
+def test_plan_respects_the_power_limit(capacity, power):
+    prices = [0.01] * 16 + [0.5] * 16
+    snapshot, start = snapshot_of(prices)
+    planner = BatteryPlanner(capacity, power, power, 100.0)
+    plan = planner.plan(planner.solve(snapshot, start), 0, start)
+    levels = [level for _, level in plan.levels]
+    step = capacity / planner.levels
+    limit = power * SLOT_SECONDS / 3600
+    assert max(levels) > 0
+    assert all(abs(b - a) * step <= limit + 1e-9 for a, b in zip(levels, levels[1:]))
@@ -0,0 +1,104 @@
+"""A44 parsing and expansion into per-day series, one fixture document per variant."""
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from conftest import FIXTURES
+from frank2.entsoe import A44Parser, expand_period
+from frank2.prices import SLOT_SECONDS, split_days
+from frank2.source import _merge_periods
+
+DAY = "20250310"
+NEXT_DAY = "20250311"
+DAY_START = int(datetime(2025, 3, 10, tzinfo=ZoneInfo("Europe/Amsterdam")).timestamp())
+
+pytestmark = pytest.mark.usefixtures("amsterdam")
+
+
+def parse(name, chunk_size=512):
+    parser = A44Parser()
+    data = (FIXTURES / name).read_bytes()
+    for i in range(0, len(data), chunk_size):
+        parser.feed(data[i:i + chunk_size])
+    parser.close()
+    return parser.periods
+
+
+def days_of(name):
+    return split_days(_merge_periods(parse(name)))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 512, 1 << 20])
+def test_chunk_boundaries_do_not_matter(chunk_size):
+    periods = parse("multiple_blocks.xml", chunk_size)
+    assert [len(period) for period in periods] == [12, 48, 24]
+    assert [period.time_series for period in periods] == [0, 0, 1]
+
+
+def test_a01_pt60m_repeats_every_hour_per_quarter():
+    (period,) = parse("a01_pt60m.xml")
+    assert (period.curve_type, period.resolution, len(period)) == ("A01", 3600, 24)
+    assert period.end - period.start == 24 * 3600
+
+    starts, prices = expand_period(period, SLOT_SECONDS)
+    assert starts == list(range(DAY_START, DAY_START + 24 * 3600, SLOT_SECONDS))
+    assert prices[:5] == [10.0, 10.0, 10.0, 10.0, 20.0]
+
+    day = days_of("a01_pt60m.xml")[DAY]
+    assert day.dense and len(day) == 96
+    assert list(day.prices[92:]) == [0.24] * 4
+
+
+def test_a03_omitted_positions_repeat_the_previous_price():
+    (period,) = parse("a03_omissions.xml")
+    assert (period.curve_type, len(period)) == ("A03", 4)
+
+    starts, prices = expand_period(period, SLOT_SECONDS)
+    # Forward filled up to the end of the period, not only up to the last position sent
+    assert len(starts) == 96
+    assert prices == [50.0] * 4 + [60.0] * 35 + [40.0] * 50 + [70.0] * 7
+
+    day = days_of("a03_omissions.xml")[DAY]
+    assert day.dense and len(day) == 96
+
+
+def test_multiple_time_series_and_periods_merge_into_days():
+    days = days_of("multiple_blocks.xml")
+    assert sorted(days) == [DAY, NEXT_DAY]
+    day = days[DAY]
+    assert day.dense and len(day) == 96
+    # PT60M until 12:00 local time, PT15M after it
+    assert list(day.prices[44:50]) == [0.112, 0.112, 0.112, 0.112, 0.201, 0.202]
+    assert day.prices[-1] == 0.248
+    next_day = days[NEXT_DAY]
+    assert next_day.dense and len(next_day) == 96
+    assert next_day.start == day.end
+
+
+def test_overlapping_blocks_the_last_one_wins():
+    day = days_of("overlap.xml")[DAY]
+    assert day.dense and len(day) == 96
+    assert list(day.prices[:24]) == [0.1] * 24
+    assert list(day.prices[24:32]) == [0.2] * 8
+    assert list(day.prices[32:]) == [0.1] * 64
+
+
+def test_missing_a01_position_stays_a_gap():
+    (period,) = parse("a01_missing_position.xml")
+    starts, prices = expand_period(period, SLOT_SECONDS)
+    assert len(starts) == 95
+    assert DAY_START + 9 * SLOT_SECONDS not in starts
+
+    day = days_of("a01_missing_position.xml")[DAY]
+    assert not day.dense
+    # Every slot after the gap is kept and the day still reaches its last slot
+    assert len(day) == 95
+    assert day.start_at(9) == DAY_START + 10 * SLOT_SECONDS
+    assert day.prices[9] == 0.011
+    assert day.end == DAY_START + 24 * 3600
+
+
+def test_resolution_not_dividing_the_period_is_skipped():
+    (period,) = parse("a03_omissions.xml")
+    assert expand_period(period, 3600) == ([], [])
@@ -0,0 +1,25 @@
+"""Price forecaster training and its holdout error."""
+from datetime import date, timedelta
+
+from frank2.forecast import HOLDOUT_DAYS, SLOTS_PER_DAY, PriceForecaster
+
+
+def profiles_of(days):
+    first = date(2025, 3, 3)
+    return {
+        first + timedelta(days=d): [0.1 + 0.01 * (q // 4) + 0.001 * d for q in range(SLOTS_PER_DAY)]
+        for d in range(days)
+    }
+
+
+def test_fit_measures_the_holdout_error():
+    forecaster = PriceForecaster()
+    assert forecaster.fit(profiles_of(3 * HOLDOUT_DAYS))
+    assert forecaster.mae is not None and forecaster.mae < 0.01
+
+
+def test_short_history_clears_the_previous_error():
+    forecaster = PriceForecaster()
+    forecaster.fit(profiles_of(3 * HOLDOUT_DAYS))
+    assert forecaster.fit(profiles_of(HOLDOUT_DAYS + 2))
+    assert forecaster.mae is None
@@ -0,0 +1,68 @@
+"""Event loop lag while a large A44 document is parsed and turned into a price snapshot."""
+import asyncio
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+
+from entsoe_server import _a44_document, a44_document
+from frank2.entsoe import A44Parser
+from frank2.prices import PriceSnapshot
+from frank2.tariff import TariffProfile
+
+PROBE_INTERVAL = 0.005
+TARIFF = TariffProfile(inkoop=0.0182, eb=0.1228, btw=21)
+
+
+class LagProbe:
+    """Largest delay of a short sleep on the event loop while the block runs."""
+
+    def __init__(self):
+        self.max_lag = 0.0
+        self._task = None
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self._run())
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # Let the probe see the delay of a block that never yielded
+        await asyncio.sleep(2 * PROBE_INTERVAL)
+        self._task.cancel()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(PROBE_INTERVAL)
+            self.max_lag = max(self.max_lag, loop.time() - started - PROBE_INTERVAL)
+
+
+def build_snapshot(source, periods):
+    """The executor stages of a refresh: days, all-in prices and the snapshot."""
+    days = source._build_days(periods)
+    return PriceSnapshot({date_str: TARIFF.apply(series) for date_str, series in days.items()}, 14, 8)
+
+
+async def test_pipeline_keeps_the_loop_responsive(hass, source, entsoe_server):
+    # A year of quarter hours, about 35000 points
+    end = dt_util.start_of_local_day(dt_util.now().date())
+    start = dt_util.start_of_local_day(end.date() - timedelta(days=365))
+    # Generating the document is the server's work, build it before the probe runs
+    body = a44_document(start.timestamp(), end.timestamp())
+    misses = _a44_document.cache_info().misses
+
+    async with LagProbe() as pipeline:
+        periods = await source.async_fetch_range(start, end)
+        snapshot = await hass.async_add_executor_job(build_snapshot, source, periods)
+    # The server answered with the document built above
+    assert _a44_document.cache_info().misses == misses
+
+    async with LagProbe() as inline:
+        parser = A44Parser()
+        parser.feed(body)
+        parser.close()
+        inline_snapshot = build_snapshot(source, parser.periods)
+
+    assert len(snapshot.days) == len(inline_snapshot.days) == 365
+    assert pipeline.max_lag < inline.max_lag / 3
@@ -0,0 +1,83 @@
+"""Price series resampling and the lowest price selection."""
+import random
+from datetime import date
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from frank2.prices import HOUR_SECONDS, SLOT_SECONDS, LowestTracker, PriceSeries
+
+pytestmark = pytest.mark.usefixtures("amsterdam")
+
+
+def day_series(day, skip=0):
+    """Dense series of a local day priced by slot number, the first skip slots left out."""
+    start = int(dt_util.start_of_local_day(day).timestamp())
+    end = int(dt_util.start_of_local_day(date.fromordinal(day.toordinal() + 1)).timestamp())
+    count = (end - start) // SLOT_SECONDS
+    prices = [float(i) for i in range(skip, count)]
+    return PriceSeries(start + skip * SLOT_SECONDS, SLOT_SECONDS, prices, prices), start, end
+
+
+def test_resample_buckets_start_at_local_midnight():
+    series, midnight, _ = day_series(date(2025, 3, 10), skip=1)
+    hourly = series.resample(HOUR_SECONDS)
+    assert hourly.start == midnight
+    assert list(hourly.starts)[:3] == [midnight, midnight + 3600, midnight + 7200]
+    # The 00:00 quarter hour is missing, the first hour averages 00:15-00:45
+    assert hourly.prices[0] == 2.0
+    assert hourly.prices[1] == 5.5
+    assert len(hourly) == 24
+
+
+def test_resample_explicit_origin():
+    series, midnight, _ = day_series(date(2025, 3, 10))
+    hourly = series.resample(HOUR_SECONDS, origin=midnight + 1800)
+    assert hourly.start == midnight - 1800
+    assert hourly.prices[0] == 0.5
+    assert hourly.prices[1] == 3.5
+
+
+@pytest.mark.parametrize(("day", "hours"), [(date(2025, 3, 30), 23), (date(2025, 10, 26), 25)])
+def test_resample_dst_days(day, hours):
+    series, midnight, end = day_series(day)
+    assert len(series) == hours * 4
+    hourly = series.resample(HOUR_SECONDS, "max")
+    assert len(hourly) == hours
+    assert hourly.dense and hourly.start == midnight and hourly.end == end
+    assert list(hourly.prices) == [4.0 * h + 3 for h in range(hours)]
+
+
+def test_resample_keeps_gaps_and_rejects_misaligned_resolutions():
+    series, midnight, _ = day_series(date(2025, 3, 10))
+    gappy = PriceSeries(midnight, SLOT_SECONDS)
+    for i in (0, 1, 2, 3, 12, 13):
+        gappy.append(series.prices[i], series.net_prices[i], series.start_at(i))
+    hourly = gappy.resample(HOUR_SECONDS)
+    assert list(hourly.starts) == [midnight, midnight + 3 * 3600]
+    assert list(hourly.prices) == [1.5, 12.5]
+    with pytest.raises(ValueError):
+        series.resample(20 * 60)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_lowest_tracker_matches_sorting(seed):
+    rng = random.Random(seed)
+    # Few distinct prices, so ties between slots are common
+    prices = [rng.choice((0.1, 0.12, 0.15, 0.2, -0.01)) for _ in range(rng.randint(1, 120))]
+    first = rng.randrange(len(prices))
+    tracker = LowestTracker(prices, rng.randint(0, 20), first)
+    for _ in range(200):
+        if rng.random() < 0.5:
+            first = min(len(prices), first + rng.randint(0, 3))
+            tracker.advance(first)
+        else:
+            tracker.resize(rng.randint(0, 20))
+        expected = sorted(range(first, len(prices)), key=lambda i: (prices[i], i))[:tracker.count]
+        assert tracker.selected() == expected
+        price = rng.choice(prices)
+        if len(expected) < tracker.count:
+            assert tracker.includes(price) == (tracker.count > 0)
+        else:
+            assert tracker.includes(price) == (bool(expected) and price < prices[expected[-1]])
@@ -0,0 +1,112 @@
+"""Job scheduler against an exhaustive search over every placement."""
+import itertools
+import random
+from datetime import date
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from frank2 import scheduler
+from frank2.prices import SLOT_SECONDS, PriceSeries, PriceSnapshot
+from frank2.scheduler import Job, schedule_jobs
+
+pytestmark = pytest.mark.usefixtures("amsterdam")
+
+SLOTS = 12
+
+
+def snapshot_of(prices):
+    start = int(dt_util.start_of_local_day(date(2025, 3, 10)).timestamp())
+    return PriceSnapshot({"20250310": PriceSeries(start, SLOT_SECONDS, prices, prices)}, 4, 4), start
+
+
+def random_jobs(rng, start):
+    jobs = []
+    for n in range(rng.randint(1, 3)):
+        deadline = start + rng.randint(6, SLOTS) * SLOT_SECONDS if rng.random() < 0.3 else None
+        jobs.append(Job(f"job{n}", rng.randint(1, 4) * SLOT_SECONDS, rng.choice((1.0, 2.0, 3.5)), deadline=deadline))
+    return jobs
+
+
+def exhaustive(prices, start, jobs, max_power):
+    """Lowest total cost of a plan placing every job, None when there is none."""
+    placements = []
+    for job in jobs:
+        slots = job.duration // SLOT_SECONDS
+        placements.append([
+            (left, left + slots, sum(prices[left:left + slots]) * SLOT_SECONDS / 3600 * job.power)
+            for left in range(SLOTS - slots + 1)
+            if job.deadline is None or start + (left + slots) * SLOT_SECONDS <= job.deadline
+        ])
+    best = None
+    for plan in itertools.product(*placements):
+        load = [0.0] * SLOTS
+        for job, (left, right, _) in zip(jobs, plan):
+            for i in range(left, right):
+                load[i] += job.power
+        if max_power is not None and max(load) > max_power + 1e-9:
+            continue
+        cost = sum(cost for _, _, cost in plan)
+        best = cost if best is None else min(best, cost)
+    return best
+
+
+def peak_load(result, jobs, start):
+    power = {job.name: job.power for job in jobs}
+    load = [0.0] * SLOTS
+    for job in result["jobs"]:
+        left = (dt_util.parse_datetime(job["start"]).timestamp() - start) // SLOT_SECONDS
+        right = (dt_util.parse_datetime(job["end"]).timestamp() - start) // SLOT_SECONDS
+        for i in range(int(left), int(right)):
+            load[i] += power[job["name"]]
+    return max(load)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_schedule_matches_exhaustive_search(seed):
+    rng = random.Random(seed)
+    prices = [round(rng.uniform(-0.05, 0.4), 5) for _ in range(SLOTS)]
+    snapshot, start = snapshot_of(prices)
+    jobs = random_jobs(rng, start)
+    max_power = rng.choice((None, 3.5, 4.0, 5.5))
+
+    result = schedule_jobs(snapshot, jobs, max_power, start - 1)
+    expected = exhaustive(prices, start, jobs, max_power)
+    if max_power is not None and result["jobs"]:
+        assert peak_load(result, jobs, start) <= max_power + 1e-9
+    if expected is None:
+        assert result["status"] == "incomplete" and not result["optimal"]
+        assert result["unscheduled"]
+    else:
+        assert result["status"] == "optimal" and result["optimal"]
+        assert result["unscheduled"] == []
+        # Job costs are rounded to 5 decimals each
+        assert result["total_cost"] == pytest.approx(expected, abs=2e-5)
+
+
+def test_unscheduled_jobs_carry_a_reason():
+    snapshot, start = snapshot_of([0.1] * SLOTS)
+    jobs = [
+        Job("too_long", (SLOTS + 1) * SLOT_SECONDS, 1.0),
+        Job("too_strong", SLOT_SECONDS, 5.0),
+        Job("fits", SLOT_SECONDS, 2.0),
+    ]
+    result = schedule_jobs(snapshot, jobs, 3.0, start - 1)
+    assert result["status"] == "incomplete" and not result["optimal"]
+    assert result["unscheduled"] == [
+        {"name": "too_long", "reason": "no_slots"},
+        {"name": "too_strong", "reason": "max_power"},
+    ]
+    assert [job["name"] for job in result["jobs"]] == ["fits"]
+
+
+def test_search_cut_short_is_not_proven_optimal(monkeypatch):
+    monkeypatch.setattr(scheduler, "EXACT_NODE_LIMIT", 0)
+    snapshot, start = snapshot_of([0.1 * i for i in range(SLOTS)])
+    # Both jobs want the first slot, the cap makes the greedy plan differ from the lower bound
+    jobs = [Job("a", SLOT_SECONDS, 2.0), Job("b", SLOT_SECONDS, 2.0)]
+    result = schedule_jobs(snapshot, jobs, 3.0, start - 1)
+    # The greedy plan places every job, only its optimality is unknown
+    assert result["status"] == "not_proven_optimal" and not result["optimal"]
+    assert result["unscheduled"] == [] and len(result["jobs"]) == 2
@@ -0,0 +1,68 @@
+"""Fetching through the shared session and request limiter, against the stand-in ENTSO-E server."""
+import asyncio
+import time
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+
+from frank2.const import DOMAIN
+from frank2.source import RequestLimiter
+
+
+def today():
+    return dt_util.now().date()
+
+
+def day_range(offset=0, days=1):
+    start = dt_util.start_of_local_day(today() + timedelta(days=offset))
+    return start, dt_util.start_of_local_day(today() + timedelta(days=offset + days))
+
+
+async def test_requests_reuse_one_pooled_connection(source, entsoe_server):
+    for offset in range(3):
+        assert await source.async_fetch_range(*day_range(offset))
+    assert len(entsoe_server.requests) == 3
+    # Keep-alive on the shared session, no new connection per request
+    assert len(entsoe_server.peers) == 1
+
+
+async def test_limiter_bounds_concurrent_requests(hass, source, entsoe_server):
+    hass.data[DOMAIN]["limiter"] = RequestLimiter(max_parallel=2, min_interval=0)
+    entsoe_server.delay = 0.1
+    results = await asyncio.gather(*(source.async_fetch_range(*day_range(offset)) for offset in range(6)))
+    assert all(results)
+    assert entsoe_server.max_active == 2
+
+
+async def test_limiter_spaces_out_request_starts(hass, source, entsoe_server):
+    hass.data[DOMAIN]["limiter"] = RequestLimiter(max_parallel=4, min_interval=0.05)
+    started = time.monotonic()
+    await asyncio.gather(*(source.async_fetch_range(*day_range(offset)) for offset in range(4)))
+    assert time.monotonic() - started >= 3 * 0.05
+
+
+async def test_request_timeout(source, entsoe_server, monkeypatch):
+    monkeypatch.setattr("frank2.source.REQUEST_TIMEOUT", 0.2)
+    entsoe_server.delay = 2
+    started = time.monotonic()
+    assert await source.async_fetch_range(*day_range()) is None
+    assert time.monotonic() - started < 1
+
+
+async def test_failed_request_returns_none(source, entsoe_server):
+    start, end = day_range()
+    entsoe_server.fail.add(dt_util.as_utc(start).strftime("%Y%m%d%H%M"))
+    assert await source.async_fetch_range(start, end) is None
+
+
+async def test_concurrent_callers_share_one_fetch_of_today_and_tomorrow(source, entsoe_server):
+    entsoe_server.delay = 0.05
+    dates = [today(), today() + timedelta(days=1)]
+    await asyncio.gather(source.async_ensure_days(dates), source.async_ensure_days(dates))
+    # Both days in a single request, shared by both callers
+    assert entsoe_server.ranges == [tuple(t.timestamp() for t in day_range(0, 2))]
+    assert all(source.is_complete(day) for day in dates)
+
+    await source.async_ensure_days(dates)
+    assert len(entsoe_server.requests) == 1
+
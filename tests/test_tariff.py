@@ -0,0 +1,61 @@
+"""Tariff profiles from the config entry and the sell prices they carry."""
+from datetime import date
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from frank2.prices import HOUR_SECONDS, SLOT_SECONDS, PriceSeries, PriceSnapshot
+from frank2.tariff import TariffProfile, parse_grid_fees
+
+pytestmark = pytest.mark.usefixtures("amsterdam")
+
+ENTRY_DATA = {
+    "inkoop": 0.02,
+    "eb": 0.1,
+    "btw": 21.0,
+    "grid_fees": "07:00-23:00=0.01; 23:00-07:00=0,005",
+    "feed_in_cost": 0.015,
+    "feed_in_vat": False,
+    "netting": False,
+}
+
+
+def net_day():
+    start = int(dt_util.start_of_local_day(date(2025, 3, 10)).timestamp())
+    prices = [0.1] * 96
+    return PriceSeries(start, SLOT_SECONDS, prices, prices)
+
+
+def test_parse_grid_fees():
+    assert parse_grid_fees(ENTRY_DATA["grid_fees"]) == [
+        {"start": "07:00", "end": "23:00", "fee": 0.01},
+        {"start": "23:00", "end": "07:00", "fee": 0.005},
+    ]
+    assert parse_grid_fees("") == []
+    for text in ("07:00-23:00", "7-23=0.01", "07:00=0.01"):
+        with pytest.raises(ValueError):
+            parse_grid_fees(text)
+
+
+def test_entry_data_configures_fees_and_feed_in():
+    profile = TariffProfile.from_entry_data(ENTRY_DATA)
+    series = profile.apply(net_day())
+    # 0.1 * 1.21 + 0.02 + 0.1 plus the fee of the local time of day
+    assert series.prices[0] == 0.246
+    assert series.prices[7 * 4] == 0.251
+    assert list(series.sell_prices) == [0.085] * 96
+
+
+def test_netting_keeps_one_price_column():
+    profile = TariffProfile.from_entry_data({"inkoop": 0.02, "eb": 0.1, "btw": 21.0})
+    series = profile.apply(net_day())
+    assert series.sell_prices is None
+    assert PriceSnapshot({"20250310": series}, 4, 4).sell_prices == series.prices
+
+
+def test_sell_prices_reach_the_snapshot_and_resampling():
+    series = TariffProfile.from_entry_data(ENTRY_DATA).apply(net_day())
+    snapshot = PriceSnapshot({"20250310": series}, 4, 4)
+    assert snapshot.current_sell_price(series.start) == 0.085
+    assert list(snapshot.resampled(HOUR_SECONDS).sell_prices) == [0.085] * 24
@@ -0,0 +1,40 @@
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from .coordinator import get_coordinator
+from .prices import AGGREGATES
+from .services import RESOLUTION_SCHEMA, price_range
+
+
+def async_setup_websocket_api(hass):
+    websocket_api.async_register_command(hass, ws_get_prices)
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "frank2/prices",
+    vol.Optional("config_entry_id"): str,
+    vol.Optional("start"): str,
+    vol.Optional("end"): str,
+    vol.Optional("resolution"): RESOLUTION_SCHEMA,
+    vol.Optional("aggregate", default="mean"): vol.In(list(AGGREGATES)),
+    vol.Optional("include_forecast", default=False): bool,
+})
+@callback
+def ws_get_prices(hass, connection, msg):
+    coordinator = get_coordinator(hass, msg.get("config_entry_id"))
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "No loaded config entry found")
+        return
+    start = dt_util.parse_datetime(msg["start"]) if "start" in msg else None
+    end = dt_util.parse_datetime(msg["end"]) if "end" in msg else None
+    if ("start" in msg and start is None) or ("end" in msg and end is None):
+        connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, "Invalid start or end")
+        return
+    connection.send_result(
+        msg["id"], {"prices": price_range(
+            coordinator, start, end, msg.get("resolution"), msg["include_forecast"], msg["aggregate"]
+        )}
+    )